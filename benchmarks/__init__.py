@@ -0,0 +1,13 @@
+"""
+Benchmarks for dbfread.
+
+These are run from the top of the source tree, for example::
+
+    python -m benchmarks.bench_records
+
+benchmarks.run runs a set of scenarios on tables of any size and mix
+of field types and writes the results as JSON, so runs with different
+versions of dbfread can be compared::
+
+    python -m benchmarks.run --records 1000000 --output results.json
+"""
@@ -0,0 +1,49 @@
+"""
+Compare iterating over records with iter_batches().
+
+Prints records per second for narrow and wide tables::
+
+    python -m benchmarks.bench_batches
+"""
+from __future__ import print_function
+import os
+import shutil
+import tempfile
+
+from dbfread import DBF
+from .synthetic import make_fields, write_table
+from .bench_records import NUMRECORDS, measure
+
+
+def iter_rows(table):
+    for batch in table.iter_batches(1000):
+        for record in batch:
+            yield record
+
+
+def iter_columns(table):
+    for batch in table.iter_batches(1000, layout='columns'):
+        for _ in range(len(next(iter(batch.values())))):
+            yield None
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for width in [4, 60]:
+            filename = os.path.join(tmpdir, 'wide{}.dbf'.format(width))
+            write_table(filename, make_fields(width), NUMRECORDS)
+
+            table = DBF(filename)
+            records = measure(iter, table)
+            rows = measure(iter_rows, table)
+            columns = measure(iter_columns, table)
+            print('{:3} fields  records: {:9.0f} rec/s'
+                  '  rows: {:9.0f} rec/s  columns: {:9.0f} rec/s'.format(
+                      width, records, rows, columns))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
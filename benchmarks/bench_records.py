@@ -0,0 +1,98 @@
+"""
+Compare whole record reads and the compiled decoder with the old
+per-field reads and the generic decoder.
+
+Prints records per second for narrow and wide tables::
+
+    python -m benchmarks.bench_records
+"""
+from __future__ import print_function
+import os
+import time
+import shutil
+import tempfile
+
+from dbfread import DBF
+from .synthetic import make_fields, write_table
+
+NUMRECORDS = 20000
+
+
+def iter_per_field(table):
+    """The baseline per-field loop, which reads one field at a time."""
+    with open(table.filename, 'rb') as infile:
+        infile.seek(table.header.headerlen, 0)
+        if table.raw:
+            def parse(field, data):
+                return data
+        else:
+            parse = table.parserclass(table).parse
+        read = infile.read
+
+        while True:
+            sep = read(1)
+            if sep == b' ':
+                items = [(field.name, parse(field, read(field.length)))
+                         for field in table.fields]
+                yield table.recfactory(items)
+            elif sep in (b'\x1a', b''):
+                break
+            else:
+                infile.seek(table.header.recordlen - 1, 1)
+
+
+def iter_generic(table):
+    """The generic record decoder used before the compiled decoder."""
+    with open(table.filename, 'rb') as infile:
+        if table.raw:
+            def parse(field, data):
+                return data
+        else:
+            parse = table.parserclass(table).parse
+
+        slices = table._get_field_slices()
+        fields = [field for field, _, _ in slices]
+        names = [field.name for field in fields]
+        unpack = table._make_unpack(slices)
+        recfactory = table.recfactory
+
+        for data in table._iter_record_data(infile):
+            if data[:1] == b' ':
+                yield recfactory(zip(names, map(parse, fields,
+                                                unpack(data))))
+
+
+def measure(func, table, repeat=3):
+    """Return the best records per second of repeat runs."""
+    best = 0
+    for _ in range(repeat):
+        start = time.time()
+        count = 0
+        for _ in func(table):
+            count += 1
+        best = max(best, count / (time.time() - start))
+    return best
+
+
+def main():
+    tmpdir = tempfile.mkdtemp()
+    try:
+        for width in [4, 60]:
+            filename = os.path.join(tmpdir, 'wide{}.dbf'.format(width))
+            write_table(filename, make_fields(width), NUMRECORDS)
+
+            for raw in [False, True]:
+                table = DBF(filename, raw=raw)
+                old = measure(iter_per_field, table)
+                generic = measure(iter_generic, table)
+                new = measure(iter, table)
+                print('{:3} fields, raw={!s:5}  per field: {:9.0f} rec/s'
+                      '  generic: {:9.0f} rec/s'
+                      '  compiled: {:9.0f} rec/s  ({:.2f}x)'.format(
+                          width, raw, old, generic, new, new / old))
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""
+Run timed scenarios on synthetic tables and write the results as JSON.
+
+    python -m benchmarks.run --records 100000 --output before.json
+    (change something)
+    python -m benchmarks.run --records 100000 --output after.json \\
+        --compare before.json
+
+The tables are made by benchmarks.synthetic with a fixed seed, so the
+same options give the same files for every run and every version of
+dbfread. Each scenario opens the table again and is run --repeat times.
+The best time is reported.
+
+Scenarios that need a package that is not installed (numpy, pyarrow)
+or a feature that the installed version of dbfread doesn't have are
+reported as skipped, so the same command can be run with older
+versions.
+"""
+from __future__ import print_function
+import os
+import sys
+import json
+import shutil
+import argparse
+import platform
+import tempfile
+import datetime
+from timeit import default_timer
+
+import dbfread
+from dbfread import DBF
+from .synthetic import make_fields, write_table
+
+
+class Skipped(Exception):
+    pass
+
+
+def _import(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        raise Skipped('{} is not installed'.format(name))
+
+
+def _require(name):
+    """Raise Skipped if DBF doesn't have this method."""
+    if not hasattr(DBF, name):
+        raise Skipped('DBF.{}() is not in dbfread {}'.format(
+            name, dbfread.__version__))
+
+
+def run_iterate(files):
+    return sum(1 for _ in DBF(files['table']))
+
+
+def run_load(files):
+    table = DBF(files['table'], load=True)
+    return len(table.records) + len(table.deleted)
+
+
+def run_len(files):
+    table = DBF(files['table'])
+    return len(table.records) + len(table.deleted)
+
+
+def run_raw(files):
+    return sum(1 for _ in DBF(files['table'], raw=True))
+
+
+def run_batches(files):
+    _require('iter_batches')
+    count = 0
+    for batch in DBF(files['table']).iter_batches(1000, layout='columns'):
+        count += len(next(iter(batch.values())))
+    return count
+
+
+def run_random_access(files):
+    _require('get_record')
+    table = DBF(files['table'])
+    with table:
+        count = len(table.records) + len(table.deleted)
+        step = max(1, count // 10000)
+        for i in range(0, count, step):
+            table.get_record(i)
+    return len(range(0, count, step))
+
+
+def run_memo(files):
+    return sum(1 for _ in DBF(files['memo']))
+
+
+def run_numpy(files):
+    _require('to_numpy')
+    _import('numpy')
+    return len(DBF(files['table']).to_numpy())
+
+
+def run_arrow(files):
+    _require('to_arrow')
+    _import('numpy')
+    _import('pyarrow')
+    return DBF(files['table']).to_arrow().num_rows
+
+
+def run_parallel(files):
+    try:
+        from dbfread import parallel
+    except ImportError:
+        raise Skipped('dbfread.parallel is not in dbfread {}'.format(
+            dbfread.__version__))
+    return sum(1 for _ in parallel.read(files['table']))
+
+
+SCENARIOS = [
+    ('iterate', run_iterate),
+    ('load', run_load),
+    ('len', run_len),
+    ('raw', run_raw),
+    ('batches', run_batches),
+    ('random_access', run_random_access),
+    ('memo', run_memo),
+    ('numpy', run_numpy),
+    ('arrow', run_arrow),
+    ('parallel', run_parallel),
+]
+
+
+def measure(func, files, repeat):
+    """Return (best time in seconds, number of records)."""
+    best = None
+    for _ in range(repeat):
+        start = default_timer()
+        count = func(files)
+        elapsed = default_timer() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, count
+
+
+def make_files(tmpdir, args):
+    files = {
+        'table': os.path.join(tmpdir, 'table.dbf'),
+        'memo': os.path.join(tmpdir, 'memo.dbf'),
+    }
+    write_table(files['table'], make_fields(args.width, args.types),
+                args.records, deleted=args.deleted,
+                memo_size=args.memo_size, memo_format=args.memo_format)
+    write_table(files['memo'], make_fields(4, 'CM'), args.records,
+                deleted=args.deleted, memo_size=args.memo_size,
+                memo_format=args.memo_format)
+    return files
+
+
+def run(args):
+    scenarios = [(name, func) for name, func in SCENARIOS
+                 if not args.scenarios or name in args.scenarios]
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        files = make_files(tmpdir, args)
+
+        results = {}
+        for name, func in scenarios:
+            try:
+                seconds, count = measure(func, files, args.repeat)
+            except Skipped as err:
+                results[name] = {'skipped': str(err)}
+                print('{:14} skipped ({})'.format(name, err))
+                continue
+
+            results[name] = {
+                'seconds': seconds,
+                'records': count,
+                'records_per_second': count / seconds if seconds else None,
+            }
+            print('{:14} {:10.4f} s  {:12.0f} rec/s'.format(
+                name, seconds, results[name]['records_per_second'] or 0))
+    finally:
+        shutil.rmtree(tmpdir)
+
+    return {
+        'dbfread_version': dbfread.__version__,
+        'python_version': platform.python_version(),
+        'python_implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'date': datetime.datetime.now().isoformat(),
+        'options': {
+            'records': args.records,
+            'width': args.width,
+            'types': args.types,
+            'deleted': args.deleted,
+            'memo_size': args.memo_size,
+            'memo_format': args.memo_format,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(old, new):
+    """Print the speedup of each scenario in new compared to old."""
+    print()
+    print('Compared with dbfread {} ({}):'.format(
+        old['dbfread_version'], old['date']))
+    if old['options'] != new['options']:
+        print('warning: the files were made with different options')
+
+    for name, result in sorted(new['results'].items()):
+        old_result = old['results'].get(name, {})
+        if 'seconds' in result and old_result.get('seconds'):
+            print('{:14} {:6.2f}x'.format(
+                name, old_result['seconds'] / result['seconds']))
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    arg = parser.add_argument
+    arg('--records', type=int, default=100000,
+        help='number of records (default 100000)')
+    arg('--width', type=int, default=20,
+        help='number of fields (default 20)')
+    arg('--types', default=None,
+        help=('field types to use in turn, for example CNFIDLM'
+              ' (default is a mix of C, N, D and L)'))
+    arg('--deleted', type=float, default=0.0,
+        help='share of deleted records (default 0)')
+    arg('--memo-size', type=int, default=100,
+        help='size of each memo in bytes (default 100)')
+    arg('--memo-format', choices=['fpt', 'dbt'], default='fpt',
+        help='memo file format (default fpt)')
+    arg('--repeat', type=int, default=3,
+        help='number of times to run each scenario (default 3)')
+    arg('--scenarios', nargs='*', metavar='SCENARIO',
+        choices=[name for name, _ in SCENARIOS],
+        help='scenarios to run (default all)')
+    arg('--output', help='write results to this JSON file')
+    arg('--compare', metavar='JSON_FILE',
+        help='compare with results from an earlier run')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv if argv is not None else sys.argv[1:])
+    results = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as outfile:
+            json.dump(results, outfile, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as infile:
+            compare(json.load(infile), results)
+
+
+if __name__ == '__main__':
+    main()
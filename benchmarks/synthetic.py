@@ -0,0 +1,195 @@
+"""
+Write synthetic DBF files for benchmarking.
+
+Only what the benchmarks need is supported: dBase III and FoxPro
+tables with C, N, F, I, D, L and M fields, and FoxPro (.fpt) or
+dBase III (.dbt) memo files.
+"""
+import os
+import struct
+import random
+import datetime
+
+DBFHeader = struct.Struct('<BBBBLHH20x')
+DBFField = struct.Struct('<11scLBB14x')
+FPTHeader = struct.Struct('>LHH504x')
+FPTMemoHeader = struct.Struct('>LL')
+
+WORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo', 'foxtrot',
+         'golf', 'hotel', 'india', 'juliet', 'kilo', 'lima']
+
+# (type, length, decimal_count)
+FIELD_TYPES = [
+    ('C', 20, 0),
+    ('N', 10, 0),
+    ('N', 12, 2),
+    ('D', 8, 0),
+    ('L', 1, 0),
+]
+
+# (length, decimal_count) for each type in make_fields(types=...).
+FIELD_SIZES = {
+    'C': (20, 0),
+    'N': (10, 0),
+    'F': (12, 2),
+    'I': (4, 0),
+    'D': (8, 0),
+    'L': (1, 0),
+    'M': (10, 0),
+}
+
+FPT_BLOCK_SIZE = 64
+DBT_BLOCK_SIZE = 512
+
+
+def make_fields(width, types=None):
+    """Return a list of (name, type, length, decimal_count) tuples.
+
+    types is a string of field types (for example 'CNDM') which are
+    used in turn. The default is a mix of C, N, D and L fields.
+    """
+    if types is None:
+        field_types = FIELD_TYPES
+    else:
+        field_types = [(type,) + FIELD_SIZES[type] for type in types]
+
+    fields = []
+    for i in range(width):
+        type, length, decimal_count = field_types[i % len(field_types)]
+        name = '{}{}'.format(type, i)
+        fields.append((name, type, length, decimal_count))
+    return fields
+
+
+def make_text(rand, size):
+    """Return about size bytes of random words."""
+    words = []
+    length = 0
+    while length < size:
+        word = rand.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words).encode('ascii')[:size]
+
+
+def make_value(rand, type, length, decimal_count):
+    """Return a random field value as it is stored in the file."""
+    if type == 'C':
+        text = ' '.join(rand.choice(WORDS) for _ in range(3))
+        return text.encode('ascii')[:length].ljust(length)
+    elif type in 'NF':
+        if decimal_count:
+            number = '{:.{}f}'.format(rand.uniform(-1e6, 1e6), decimal_count)
+        else:
+            number = str(rand.randint(-10 ** 6, 10 ** 6))
+        return number.encode('ascii').rjust(length)
+    elif type == 'I':
+        return struct.pack('<i', rand.randint(-2 ** 31, 2 ** 31 - 1))
+    elif type == 'D':
+        date = datetime.date(1990, 1, 1) + datetime.timedelta(
+            rand.randint(0, 12000))
+        return date.strftime('%Y%m%d').encode('ascii')
+    elif type == 'L':
+        return rand.choice([b'T', b'F', b'?'])
+    elif type == 'M':
+        # Filled in by write_table().
+        return b' ' * length
+    else:
+        raise ValueError('unsupported field type {!r}'.format(type))
+
+
+class MemoWriter(object):
+    """Write memos to a FoxPro (.fpt) or dBase III (.dbt) memo file."""
+    def __init__(self, filename, memo_format):
+        self.memo_format = memo_format
+        self.outfile = open(filename, 'wb')
+        if memo_format == 'fpt':
+            self.block_size = FPT_BLOCK_SIZE
+        else:
+            self.block_size = DBT_BLOCK_SIZE
+        # The header takes up the first 512 bytes.
+        self.next_block = 512 // self.block_size
+        self.outfile.write(b'\0' * 512)
+
+    def write(self, data):
+        """Write a memo and return its block number."""
+        if self.memo_format == 'fpt':
+            data = FPTMemoHeader.pack(1, len(data)) + data
+        else:
+            data += b'\x1a\x1a'
+        blocks = -(-len(data) // self.block_size)
+        self.outfile.write(data.ljust(blocks * self.block_size, b'\0'))
+
+        block = self.next_block
+        self.next_block += blocks
+        return block
+
+    def close(self):
+        self.outfile.seek(0)
+        if self.memo_format == 'fpt':
+            self.outfile.write(FPTHeader.pack(self.next_block, 0,
+                                              self.block_size))
+        else:
+            self.outfile.write(struct.pack('<L', self.next_block))
+        self.outfile.close()
+
+
+def write_table(filename, fields, numrecords, seed=0, deleted=0.0,
+                memo_size=100, memo_format='fpt'):
+    """Write a table with numrecords random records.
+
+    deleted is the share of records that are marked as deleted. If
+    there are M fields, each record gets its own memo of memo_size
+    bytes in a memo file next to the table. memo_format is 'fpt' or
+    'dbt'.
+    """
+    rand = random.Random(seed)
+    recordlen = 1 + sum(length for _, _, length, _ in fields)
+    headerlen = DBFHeader.size + DBFField.size * len(fields) + 1
+
+    memo_offsets = []
+    offset = 1
+    for _, type, length, _ in fields:
+        if type == 'M':
+            memo_offsets.append((offset, length))
+        offset += length
+
+    if not memo_offsets:
+        dbversion = 0x03
+        memofile = None
+    else:
+        if memo_format not in ('fpt', 'dbt'):
+            raise ValueError('unknown memo format {!r}'.format(memo_format))
+        dbversion = 0xf5 if memo_format == 'fpt' else 0x83
+        memo_filename = os.path.splitext(filename)[0] + '.' + memo_format
+        memofile = MemoWriter(memo_filename, memo_format)
+        memos = [make_text(rand, memo_size) for _ in range(100)]
+
+    # A small pool of records is enough to keep the parser busy.
+    pool = []
+    for _ in range(min(numrecords, 1000)):
+        values = [make_value(rand, type, length, decimal_count)
+                  for _, type, length, decimal_count in fields]
+        pool.append(b' ' + b''.join(values))
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(DBFHeader.pack(dbversion, 114, 8, 2, numrecords,
+                                     headerlen, recordlen))
+        for name, type, length, decimal_count in fields:
+            outfile.write(DBFField.pack(name.encode('ascii'),
+                                        type.encode('ascii'),
+                                        0, length, decimal_count))
+        outfile.write(b'\r')
+        for i in range(numrecords):
+            data = pool[i % len(pool)]
+            if deleted and rand.random() < deleted:
+                data = b'*' + data[1:]
+            for offset, length in memo_offsets:
+                block = memofile.write(rand.choice(memos))
+                pointer = str(block).encode('ascii').rjust(length)
+                data = data[:offset] + pointer + data[offset + length:]
+            outfile.write(data)
+        outfile.write(b'\x1a')
+
+    if memofile is not None:
+        memofile.close()
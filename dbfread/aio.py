@@ -0,0 +1,208 @@
+"""
+Read DBF files in asyncio programs.
+
+File and memo I/O and parsing are done in an executor (by default
+the event loop's thread pool), one batch of records at a time, so the
+event loop is never blocked for more than the time it takes to hand
+over a batch. A batch is only read when the previous one has been
+consumed, so a slow consumer is never flooded with records.
+
+    async for record in AsyncDBF('people.dbf'):
+        print(record)
+
+    async for batch in AsyncDBF('people.dbf').iter_batches(1000):
+        await insert_many(batch)
+
+The header is read by DBF() when the AsyncDBF is created. This is a
+small read, but if it matters you can create the DBF object in an
+executor and pass it to AsyncDBF instead of a file name.
+
+(This module is written without async/await so it can still be
+compiled by Python 2, but it's only usable in Python 3.)
+"""
+import asyncio
+import threading
+import collections
+
+from .dbf import DBF
+
+
+def _transfer(source, target):
+    """Copy the outcome of the future source to the future target."""
+    if target.cancelled():
+        return
+    elif source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class AsyncBatchIterator(object):
+    """Asynchronous iterator over batches of records.
+
+    Each call to __anext__() reads and parses one batch in the
+    executor. If the waiting task is cancelled the batch is kept and
+    returned by the next call.
+    """
+    def __init__(self, batches, executor=None, loop=None):
+        self._batches = batches
+        self._executor = executor
+        self._loop = loop
+        # Future for the batch that is being read.
+        self._pending = None
+        # Makes sure only one thread runs the generator at a time.
+        self._lock = threading.Lock()
+        self._done = False
+
+    def _get_loop(self):
+        if self._loop is None:
+            return asyncio.get_event_loop()
+        else:
+            return self._loop
+
+    def _next_batch(self):
+        with self._lock:
+            if self._done:
+                raise StopAsyncIteration  # noqa: F821
+            try:
+                return next(self._batches)
+            except StopIteration:
+                self._done = True
+                raise StopAsyncIteration  # noqa: F821
+
+    def _close(self):
+        with self._lock:
+            self._done = True
+            self._batches.close()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        loop = self._get_loop()
+        if self._pending is None:
+            self._pending = loop.run_in_executor(self._executor,
+                                                 self._next_batch)
+
+        result = loop.create_future()
+
+        def done(pending):
+            if not result.cancelled():
+                self._pending = None
+                _transfer(pending, result)
+
+        self._pending.add_done_callback(done)
+        return result
+
+    def aclose(self):
+        """Stop reading and close the files. Returns a future."""
+        loop = self._get_loop()
+        return loop.run_in_executor(self._executor, self._close)
+
+
+class AsyncRecordIterator(object):
+    """Asynchronous iterator over records, read in batches.
+
+    If the waiting task is cancelled the batch that is being read is
+    kept and the next call waits for the same batch.
+    """
+    def __init__(self, batches):
+        self._batches = batches
+        self._records = collections.deque()
+        # Future for the batch that is being read.
+        self._pending = None
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        result = self._batches._get_loop().create_future()
+        self._next_record(result)
+        return result
+
+    def _add_batch(self, pending):
+        self._pending = None
+        if not pending.cancelled() and pending.exception() is None:
+            self._records.extend(pending.result())
+
+    def _next_record(self, result):
+        if result.cancelled():
+            return
+        elif self._records:
+            result.set_result(self._records.popleft())
+            return
+
+        if self._pending is None:
+            self._pending = self._batches.__anext__()
+            # Added first so it's called before the callbacks of the
+            # waiters.
+            self._pending.add_done_callback(self._add_batch)
+        pending = self._pending
+
+        def done(_):
+            if pending.cancelled() or pending.exception() is not None:
+                _transfer(pending, result)
+            else:
+                self._next_record(result)
+
+        pending.add_done_callback(done)
+
+    def aclose(self):
+        """Stop reading and close the files. Returns a future."""
+        return self._batches.aclose()
+
+
+class AsyncDBF(object):
+    """DBF table for use in asyncio programs.
+
+    table is a file name or a DBF object. Keyword arguments are passed
+    on to DBF(). Records are read batch_size at a time in executor
+    (default is the event loop's default executor).
+    """
+    def __init__(self, table, batch_size=1000, executor=None, loop=None,
+                 **kwargs):
+        if isinstance(table, DBF):
+            self.table = table
+        else:
+            self.table = DBF(table, **kwargs)
+
+        self.batch_size = batch_size
+        self.executor = executor
+        self._loop = loop
+
+    def _run(self, func, *args):
+        loop = self._loop or asyncio.get_event_loop()
+        return loop.run_in_executor(self.executor, func, *args)
+
+    def iter_batches(self, size=None, layout='rows', deleted=False):
+        """Return an asynchronous iterator over batches of records.
+
+        See DBF.iter_batches() for the arguments.
+        """
+        batches = self.table.iter_batches(size or self.batch_size, layout,
+                                          deleted)
+        return AsyncBatchIterator(batches, self.executor, self._loop)
+
+    def __aiter__(self):
+        return AsyncRecordIterator(self.iter_batches())
+
+    def load(self):
+        """Load records into memory. Returns a future.
+
+        When it's done the records are in self.table.records and
+        self.table.deleted.
+        """
+        return self._run(self.table.load)
+
+    def count(self, deleted=False):
+        """Return a future with the number of records."""
+        if deleted:
+            return self._run(len, self.table.deleted)
+        else:
+            return self._run(len, self.table.records)
+
+    def close(self):
+        """Close files used for random access and lazy memos."""
+        self.table.close()
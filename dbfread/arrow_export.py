@@ -0,0 +1,321 @@
+"""
+Convert records to Apache Arrow record batches and tables.
+
+Columns are built from the record data with NumPy (see numpy_export)
+and handed to Arrow without creating a record for every row.
+
+The Arrow type of each field is decided before any records are read,
+so all batches have the same schema and can be written to a Parquet
+file or a stream as they are made. Types come from the field
+definitions. Fields with a custom parser get the type of their values
+in the first batch.
+
+Fields listed in the dictionary argument are returned as dictionary
+encoded arrays. For text fields the distinct values are found in the
+raw data, so each distinct value is only decoded once.
+
+This requires pyarrow and NumPy, which are only imported when these
+functions are called.
+"""
+import copy
+import numbers
+from decimal import Decimal
+
+from .numpy_export import (VFP_VERSIONS, _iter_raw_records, _convert_column,
+                           _convert_text, _parse_values)
+
+# Numbers with up to this many digits always fit in an int64.
+INT64_DIGITS = 18
+# Largest precision of decimal128.
+DECIMAL_DIGITS = 38
+
+
+def _get_number_type(pa, table, field):
+    """Return the Arrow type for an N field.
+
+    Fields with no decimals are int64 if the field is short enough to
+    always fit and decimal128 if not. With numeric_mode='decimal'
+    fields with decimals are decimal128.
+    """
+    if field.length > DECIMAL_DIGITS:
+        return pa.float64()
+    elif field.decimal_count == 0:
+        if field.length <= INT64_DIGITS:
+            return pa.int64()
+        else:
+            return pa.decimal128(field.length, 0)
+    elif table.numeric_mode == 'decimal':
+        return pa.decimal128(field.length, field.decimal_count)
+    else:
+        return pa.float64()
+
+
+def _has_binary_memos(table):
+    """Return True if M fields can have binary memos.
+
+    Visual FoxPro can store binary data in memo fields.
+    """
+    filename = table.memofilename
+    return filename is not None and filename.lower().endswith('.fpt')
+
+
+def _get_arrow_type(pa, table, parser, field):
+    """Return the Arrow type for a field.
+
+    Returns None if the type should be inferred from the values.
+    """
+    field_type = field.type
+
+    if table.raw:
+        return pa.binary()
+    elif not parser.uses_default_parser(field_type):
+        return None
+    elif field_type in 'CV':
+        return pa.string()
+    elif field_type == 'N':
+        return _get_number_type(pa, table, field)
+    elif field_type in 'FO':
+        return pa.float64()
+    elif field_type == 'B' and table.header.dbversion in VFP_VERSIONS:
+        return pa.float64()
+    elif field_type in 'I+':
+        return pa.int32()
+    elif field_type == 'D':
+        return pa.date32()
+    elif field_type in 'T@':
+        return pa.timestamp('ms')
+    elif field_type == 'Y':
+        return pa.decimal128(19, 4)
+    elif field_type == 'L':
+        return pa.bool_()
+    elif field_type == 'M':
+        if _has_binary_memos(table):
+            return pa.large_binary()
+        else:
+            return pa.large_string()
+    elif field_type in 'GPB':
+        return pa.large_binary()
+    elif field_type == '0':
+        return pa.binary()
+    else:
+        return None
+
+
+def _get_arrow_types(pa, np, table, slices, batch_size):
+    """Return the Arrow type for each field.
+
+    Types that can't be decided from the field definition are taken
+    from the parsed values in the first batch.
+    """
+    parser = table.parserclass(table)
+    types = [_get_arrow_type(pa, table, parser, field)
+             for field, _, _ in slices]
+
+    if None in types:
+        for records, parse in _iter_raw_records(np, table, slices,
+                                                batch_size):
+            for i, (field, _, _) in enumerate(slices):
+                if types[i] is None:
+                    values = _parse_values(np, parse, field,
+                                           records['v{}'.format(i)])
+                    types[i] = pa.array(values).type
+            break
+
+    return [pa.null() if type is None else type for type in types]
+
+
+def _make_schema(pa, slices, types, dictionary):
+    fields = []
+    for (field, _, _), type in zip(slices, types):
+        if field.name in dictionary:
+            type = pa.dictionary(pa.int32(), type)
+        fields.append(pa.field(field.name, type))
+    return pa.schema(fields)
+
+
+def _get_dictionary_names(table, dictionary):
+    """Return a set of names of fields to dictionary encode."""
+    if not dictionary:
+        return set()
+    else:
+        # Check that the fields exist.
+        table._get_field_slices(dictionary)
+        return set(dictionary)
+
+
+def _convert_dictionary(pa, np, table, field, column):
+    """Dictionary encode a text column.
+
+    Only the distinct values are decoded.
+    """
+    column = np.char.rstrip(column, b'\0 ')
+    values, indices = np.unique(column, return_inverse=True)
+    values = _convert_text(np, table, field, values)
+    return pa.DictionaryArray.from_arrays(
+        pa.array(indices.ravel().astype(np.int32)),
+        pa.array(values, type=pa.string()))
+
+
+def _convert_integer(np, column):
+    """Convert an N field with no decimals to int64.
+
+    Raises ValueError if a value is not a whole number.
+    """
+    column = np.char.strip(column, b' *\0')
+    blank = column == b''
+    digits = np.char.lstrip(column, b'+-')
+    if not (np.char.isdigit(digits) | blank).all():
+        raise ValueError('not an integer')
+    column[blank] = b'0'
+    return column.astype(np.int64), blank
+
+
+def _to_integer(field, value):
+    """Return a parsed value from an N field with no decimals as an int.
+
+    Raises ValueError if it's not a whole number.
+    """
+    if value is None or isinstance(value, numbers.Integral):
+        return value
+    elif value == int(value):
+        return int(value)
+    else:
+        raise ValueError('Value {!r} in field {} with no decimals is not'
+                         ' an integer'.format(value, field.name))
+
+
+def _convert_currency(pa, np, column):
+    # Decimal128 is a 16 byte little endian integer.
+    pairs = np.empty((len(column), 2), dtype='<i8')
+    pairs[:, 0] = column
+    pairs[:, 1] = column >> 63
+    return pa.Array.from_buffers(pa.decimal128(19, 4), len(column),
+                                 [None, pa.py_buffer(pairs)])
+
+
+def _convert_arrow_column(pa, np, table, field, type, column):
+    if field.type == 'Y':
+        return _convert_currency(pa, np, column)
+    elif pa.types.is_decimal(type):
+        # Parsed one value at a time to keep all digits.
+        return None
+    elif type == pa.int64():
+        values, mask = _convert_integer(np, column)
+        return pa.array(values, type=type, mask=mask)
+
+    values = _convert_column(np, table, field, column)
+    if values.dtype.kind == 'f':
+        return pa.array(values, type=type, mask=np.isnan(values))
+    elif values.dtype.kind == 'M':
+        return pa.array(values, type=type, mask=np.isnat(values))
+    else:
+        return pa.array(values, type=type)
+
+
+def _parse_arrow_column(pa, np, table, parse, field, type, column):
+    """Parse a column one value at a time and convert it to type."""
+    if field.type == 'M' and type == pa.large_binary():
+        # Read the memos as binary (G) so text memos are not decoded.
+        field = copy.copy(field)
+        field.type = 'G'
+
+    values = _parse_values(np, parse, field, column)
+    if pa.types.is_integer(type):
+        values = [_to_integer(field, value) for value in values]
+    elif pa.types.is_decimal(type) and type.scale == 0:
+        values = [None if value is None else Decimal(_to_integer(field, value))
+                  for value in values]
+    return pa.array(values, type=type)
+
+
+def _make_batch(pa, np, table, parse, slices, types, schema, records,
+                dictionary):
+    arrays = []
+    for i, (field, _, _) in enumerate(slices):
+        name = 'f{}'.format(i)
+        type = types[i]
+        encode = field.name in dictionary
+        array = None
+        if name in records.dtype.names:
+            try:
+                if encode and type == pa.string():
+                    array = _convert_dictionary(pa, np, table, field,
+                                                records[name])
+                else:
+                    array = _convert_arrow_column(pa, np, table, field,
+                                                  type, records[name])
+            except (ValueError, OverflowError):
+                # Let the field parser deal with the bad values.
+                pass
+
+        if array is None:
+            array = _parse_arrow_column(pa, np, table, parse, field, type,
+                                        records['v{}'.format(i)])
+
+        if encode and not isinstance(array, pa.DictionaryArray):
+            array = array.dictionary_encode()
+        arrays.append(array)
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _Batches(object):
+    """The schema and batches for a table."""
+    def __init__(self, pa, np, table, batch_size, columns, dictionary):
+        self._pa = pa
+        self._np = np
+        self._table = table
+        self._batch_size = batch_size
+        self._slices = table._get_field_slices(columns)
+        self._types = _get_arrow_types(pa, np, table, self._slices,
+                                       batch_size)
+        self._dictionary = _get_dictionary_names(table, dictionary)
+        self.schema = _make_schema(pa, self._slices, self._types,
+                                   self._dictionary)
+
+    def __iter__(self):
+        for records, parse in _iter_raw_records(self._np, self._table,
+                                                self._slices,
+                                                self._batch_size):
+            yield _make_batch(self._pa, self._np, self._table, parse,
+                              self._slices, self._types, self.schema,
+                              records, self._dictionary)
+
+
+def arrow_schema(table, batch_size=65536, columns=None, dictionary=None):
+    """Return the pyarrow.Schema of the batches from iter_arrow_batches().
+
+    Fields with a custom parser are parsed in the first batch to find
+    their types.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    return _Batches(pa, np, table, batch_size, columns, dictionary).schema
+
+
+def iter_arrow_batches(table, batch_size=65536, columns=None,
+                       dictionary=None):
+    """Yield records as pyarrow.RecordBatch objects.
+
+    Deleted records are left out, so batches may be shorter than
+    batch_size. columns overrides table.columns. dictionary is a list
+    of names of fields to dictionary encode. All batches have the
+    schema returned by arrow_schema().
+
+    Raises ValueError if an N field with no decimals has a value with
+    decimals.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    return iter(_Batches(pa, np, table, batch_size, columns, dictionary))
+
+
+def to_arrow(table, batch_size=65536, columns=None, dictionary=None):
+    """Return all records as a pyarrow.Table."""
+    import numpy as np
+    import pyarrow as pa
+
+    batches = _Batches(pa, np, table, batch_size, columns, dictionary)
+    return pa.Table.from_batches(list(batches), schema=batches.schema)
@@ -3,6 +3,8 @@ Class to read DBF files.
 """
 import os
 import sys
+import mmap
+import struct
 import datetime
 import platform
 import collections
@@ -10,10 +12,18 @@ import collections
 from .ifiles import ifind
 from .struct_parser import StructParser
 from .field_parser import FieldParser
-from .memo import find_memofile, open_memofile, FakeMemoFile
+from .memo import (find_memofile, open_memofile, FakeMemoFile,
+                   LazyMemoFile, SharedMemoFile, MemoCache)
 from .codepages import guess_encoding
 from .dbversions import get_dbversion_string
 from .exceptions import DBFNotFound, MissingMemoFile
+from .where import compile_where
+from .record import RecordSchema, LazyRecord
+from .decoder import compile_decode
+from .index import open_index, find_structural_index, CDXFile
+from .keyindex import KeyIndex, get_stamp, write_key_index
+from .value_cache import ValueCache, can_cache
+from .stats import Stats
 
 _py_version = (sys.version_info.major, sys.version_info.minor)
 _py_impl = platform.python_implementation()
@@ -22,6 +32,8 @@ if _py_version >= (3, 7) or (_py_version == (3, 6) and _py_impl == 'CPython'):
 else:
     ORDERED_DICT = collections.OrderedDict
 
+# Records are read from disk in blocks of roughly this many bytes.
+BLOCK_SIZE = 64 * 1024
 
 DBFHeader = StructParser(
     'DBFHeader',
@@ -92,7 +104,17 @@ class DBF(object):
                  load=False,
                  raw=False,
                  ignore_missing_memofile=False,
-                 char_decode_errors='strict'):
+                 char_decode_errors='strict',
+                 columns=None,
+                 where=None,
+                 memo_cache_size=0,
+                 lazy_memos=False,
+                 lazy_records=False,
+                 numeric_mode='auto',
+                 value_cache_types='DL',
+                 value_cache_size=4096,
+                 stats=False,
+                 stats_callback=None):
 
         self.encoding = encoding
         self.ignorecase = ignorecase
@@ -101,9 +123,35 @@ class DBF(object):
         self.raw = raw
         self.ignore_missing_memofile = ignore_missing_memofile
         self.char_decode_errors = char_decode_errors
+        self.columns = columns
+        self.where = where
+        self.memo_cache_size = memo_cache_size
+        self.lazy_memos = lazy_memos
+        self.lazy_records = lazy_records
+
+        if numeric_mode not in ('auto', 'float', 'decimal'):
+            raise ValueError('numeric_mode must be \'auto\', \'float\''
+                             ' or \'decimal\'')
+        self.numeric_mode = numeric_mode
+
+        self.value_cache_types = value_cache_types or ''
+        self.value_cache_size = value_cache_size
+        # Field name -> ValueCache, filled in by self._make_decode().
+        self.value_caches = {}
+
+        if memo_cache_size:
+            self.memo_cache = MemoCache(memo_cache_size)
+        else:
+            self.memo_cache = None
+
+        if stats or stats_callback is not None:
+            self.stats = Stats(stats_callback)
+        else:
+            self.stats = None
 
         if recfactory is None:
-            self.recfactory = lambda items: items
+            # list() returns the list of (name, value) pairs as is.
+            self.recfactory = list
         else:
             self.recfactory = recfactory
 
@@ -112,6 +160,21 @@ class DBF(object):
         self.name = os.path.splitext(self.name)[0].lower()
         self._records = None
         self._deleted = None
+        # ((size, mtime), counts) from self._count_flags().
+        self._flag_counts = None
+
+        # Opened by self._open_mmap() for random access.
+        self._mmap = None
+        self._mmap_count = 0
+        self._mmap_memofile = None
+        self._mmap_decode = None
+
+        # Opened by self._get_memofile() for lazy memos.
+        self._memofile = None
+
+        # Index tags by upper case name. Filled in by self.get_index().
+        self._indexes = None
+        self._key_indexes = {}
 
         if ignorecase:
             self.filename = ifind(filename)
@@ -130,6 +193,9 @@ class DBF(object):
             self._read_header(infile)
             self._read_field_headers(infile)
             self._check_headers()
+            # Check that the columns exist.
+            self._get_field_slices()
+            self._make_match(None)
 
             try:
                 self.date = datetime.date(expand_year(self.header.year),
@@ -148,6 +214,12 @@ class DBF(object):
     def dbversion(self):
         return get_dbversion_string(self.header.dbversion)
 
+    def _needs_memofile(self, slices=None):
+        """Return True if any of the fields in slices are memo fields."""
+        if slices is None:
+            slices = self._get_field_slices()
+        return any(field.type in 'MGPB' for field, _, _ in slices)
+
     def _get_memofilename(self):
         # Does the table have a memo field?
         field_types = [field.type for field in self.fields]
@@ -157,7 +229,7 @@ class DBF(object):
 
         path = find_memofile(self.filename)
         if path is None:
-            if self.ignore_missing_memofile:
+            if self.ignore_missing_memofile or not self._needs_memofile():
                 return None
             else:
                 raise MissingMemoFile('missing memo file for {}'.format(
@@ -178,8 +250,18 @@ class DBF(object):
 
         """
         if not self.loaded:
-            self._records = list(self._iter_records(b' '))
-            self._deleted = list(self._iter_records(b'*'))
+            records = []
+            deleted = []
+            append_record = records.append
+            append_deleted = deleted.append
+            for is_deleted, record in self.iter_all():
+                if is_deleted:
+                    append_deleted(record)
+                else:
+                    append_record(record)
+
+            self._records = records
+            self._deleted = deleted
 
     def unload(self):
         """Unload records from memory.
@@ -249,12 +331,46 @@ class DBF(object):
 
             self.fields.append(field)
 
-    def _open_memofile(self):
-        if self.memofilename and not self.raw:
-            return open_memofile(self.memofilename, self.header.dbversion)
+    def _open_memofile(self, slices=None, allow_lazy=True):
+        if self.memofilename and not self.raw \
+                and self._needs_memofile(slices):
+            if self.lazy_memos and allow_lazy:
+                return LazyMemoFile(self._get_memofile)
+            else:
+                return self._wrap_memofile(
+                    open_memofile(self.memofilename,
+                                  self.header.dbversion,
+                                  self.memo_cache))
         else:
             return FakeMemoFile(self.memofilename)
 
+    def _wrap_memofile(self, memofile):
+        if self.stats is None:
+            return memofile
+        else:
+            return self.stats.wrap_memofile(memofile)
+
+    def _open_table_file(self):
+        """Open the DBF file for a pass over the records."""
+        infile = open(self.filename, 'rb')
+        if self.stats is None:
+            return infile
+        else:
+            return self.stats.open_file(infile)
+
+    def _get_memofile(self):
+        """Return the memo file that lazy memos are read from.
+
+        It's opened the first time it's needed and is kept open until
+        close() is called.
+        """
+        if self._memofile is None:
+            self._memofile = self._wrap_memofile(
+                open_memofile(self.memofilename,
+                              self.header.dbversion,
+                              self.memo_cache))
+        return self._memofile
+
     def _check_headers(self):
         field_parser = self.parserclass(self)
 
@@ -273,63 +389,580 @@ class DBF(object):
                 # Todo: return as byte string?
                 raise ValueError('Unknown field type: {!r}'.format(field.type))
 
-    def _skip_record(self, infile):
-        # -1 for the record separator which was already read.
-        infile.seek(self.header.recordlen - 1, 1)
-
     def _count_records(self, record_type=b' '):
-        count = 0
+        if self.where is not None:
+            return self._count_matching_records(record_type)
+        return self._count_flags().get(record_type, 0)
 
-        with open(self.filename, 'rb') as infile:
-            # Skip to first record.
-            infile.seek(self.header.headerlen, 0)
+    def _count_flags(self):
+        """Return a dictionary with the number of records for each
+        deletion flag.
 
-            while True:
-                sep = infile.read(1)
-                if sep == record_type:
+        The deletion flags are read from a memory map of the file with
+        a strided slice. The result is cached until the size or
+        modification time of the file changes.
+        """
+        stat = os.stat(self.filename)
+        key = (stat.st_size, stat.st_mtime)
+        if self._flag_counts is not None and self._flag_counts[0] == key:
+            return self._flag_counts[1]
+
+        headerlen = self.header.headerlen
+        recordlen = self.header.recordlen
+        count = max(0, stat.st_size - headerlen) // recordlen
+
+        flags = b''
+        if count:
+            with open(self.filename, 'rb') as infile:
+                mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+                stop = headerlen + count * recordlen
+                try:
+                    flags = mm[headerlen:stop:recordlen]
+                finally:
+                    mm.close()
+
+        end = flags.find(b'\x1a')
+        if end >= 0:
+            flags = flags[:end]
+
+        counts = {b' ': flags.count(b' '), b'*': flags.count(b'*')}
+        self._flag_counts = (key, counts)
+        return counts
+
+    def _count_matching_records(self, record_type):
+        count = 0
+        with self._open_table_file() as infile, \
+                self._open_memofile(self._get_where_slices()) as memofile:
+            match = self._make_match(memofile)
+            for data in self._iter_record_data(infile):
+                if data[:1] == record_type and match(data):
                     count += 1
-                    self._skip_record(infile)
-                elif sep in (b'\x1a', b''):
-                    # End of records.
-                    break
-                else:
-                    self._skip_record(infile)
-
         return count
 
-    def _iter_records(self, record_type=b' '):
-        with open(self.filename, 'rb') as infile, \
-             self._open_memofile() as memofile:
+    def _get_where_slices(self):
+        """Return slices for the fields used in the where option."""
+        return [s for s in self._get_field_slices(self.field_names)
+                if s[0].name in (self.where or {})]
 
-            # Skip to first record.
-            infile.seek(self.header.headerlen, 0)
+    def _make_match(self, memofile):
+        """Return a function that takes record data and returns True if
+        the record matches the where option, or None if there is no
+        where option."""
+        if self.where is None:
+            return None
+        elif self.raw:
+            parser = None
+        else:
+            parser = self.parserclass(self, memofile)
+        return compile_where(self, parser, self.where)
+
+    def _get_field_slices(self, columns=None):
+        """Return a list of (field, start, end) tuples.
+
+        start and end are offsets into the record data, which begins
+        with the deletion flag. Only fields named in columns (or
+        self.columns if columns is None) are included.
+        """
+        if columns is None:
+            columns = self.columns
+
+        slices = []
+        start = 1
+        for field in self.fields:
+            end = start + field.length
+            slices.append((field, start, end))
+            start = end
+
+        if columns is not None:
+            for name in columns:
+                if name not in self.field_names:
+                    raise ValueError('Unknown field: {!r}'.format(name))
+            slices = [s for s in slices if s[0].name in columns]
+
+        return slices
+
+    def _make_unpack(self, slices):
+        """Return a function that takes record data and returns a
+        sequence with the data for each field in slices."""
+        recordlen = self.header.recordlen
+        format = '<'
+        pos = 0
+        for _, start, end in slices:
+            if start < pos:
+                break
+            format += '{}x{}s'.format(start - pos, end - start)
+            pos = end
+        else:
+            if pos <= recordlen:
+                format += '{}x'.format(recordlen - pos)
+                return struct.Struct(format).unpack
+
+        # Field sizes don't add up to the record length.
+        def unpack(data):
+            return [data[start:end] for _, start, end in slices]
+
+        return unpack
+
+    def _iter_record_data(self, infile, start=0, stop=None):
+        """Yield the data of each record from record number start up to
+        (but not including) stop.
+
+        Records are read in blocks of about BLOCK_SIZE bytes. The data
+        includes the deletion flag. Stops at end of file, at the end of
+        file marker or at an incomplete record.
+        """
+        recordlen = self.header.recordlen
+        block_size = max(1, BLOCK_SIZE // recordlen) * recordlen
+        infile.seek(self.header.headerlen + start * recordlen, 0)
+
+        while True:
+            if stop is not None:
+                block_size = min(block_size, (stop - start) * recordlen)
+                if block_size <= 0:
+                    return
+                start += block_size // recordlen
+
+            block = infile.read(block_size)
+            for offset in range(0, len(block) - recordlen + 1, recordlen):
+                data = block[offset:offset + recordlen]
+                if data[:1] == b'\x1a':
+                    return
+                yield data
+
+            if len(block) < block_size:
+                return
+
+    def _make_parse(self, memofile):
+        """Return a function that takes a field and data and returns
+        the value."""
+        if self.raw:
+            def parse(_, data):
+                return data
+            return parse
+        else:
+            return self._wrap_parse(self.parserclass(self, memofile).parse)
+
+    def _wrap_parse(self, parse):
+        if self.stats is None:
+            return parse
+        else:
+            return self.stats.wrap_parse(parse)
 
-            if self.raw:
-                def parse(_, data):
-                    return data
+    def _make_decode(self, memofile):
+        """Return a function that takes record data and returns a record."""
+        if self.lazy_records:
+            return self._make_lazy_decode()
+
+        slices = self._get_field_slices()
+        fields = [field for field, _, _ in slices]
+        unpack = self._make_unpack(slices)
+
+        if self.raw:
+            parse_functions = None
+        else:
+            parse_functions = self._make_parse_functions(memofile, fields)
+
+        if self.stats is None:
+            recfactory = self.recfactory
+        else:
+            recfactory = self.stats.wrap_recfactory(self.recfactory)
+
+        return compile_decode(fields, parse_functions, unpack, recfactory)
+
+    def _make_parse_functions(self, memofile, fields):
+        """Return a list with a function for each field that takes the
+        field and data and returns the value."""
+        if self.raw:
+            return [self._make_parse(memofile)] * len(fields)
+
+        parser = self.parserclass(self, memofile)
+        return [self._wrap_parse(self._cache_values(field, parser))
+                for field in fields]
+
+    def _cache_values(self, field, parser):
+        """Return the parse function for a field, using a value cache
+        if the field type is in value_cache_types."""
+        parse = parser.get_parse_function(field)
+        if not self.value_cache_size:
+            return parse
+        elif not can_cache(field, parser, self.value_cache_types):
+            return parse
+
+        cache = self.value_caches.get(field.name)
+        if cache is None:
+            cache = ValueCache(self.value_cache_size)
+            self.value_caches[field.name] = cache
+        return cache.wrap(parse)
+
+    def _make_lazy_decode(self):
+        """Return a function that takes record data and returns a
+        LazyRecord.
+
+        Fields are parsed after the iteration is done, so memos are
+        read from the memo file that the table keeps open.
+        """
+        slices = self._get_field_slices()
+        if not self.memofilename or self.raw \
+                or not self._needs_memofile(slices):
+            memofile = None
+        elif self.lazy_memos:
+            memofile = LazyMemoFile(self._get_memofile)
+        else:
+            memofile = SharedMemoFile(self._get_memofile)
+
+        fields = [field for field, _, _ in slices]
+        schema = RecordSchema(slices,
+                              self._make_parse_functions(memofile, fields))
+
+        def decode(data):
+            return LazyRecord(schema, data)
+
+        return decode
+
+    def _make_decode_columns(self, memofile):
+        """Return a function that takes a list of record data and
+        returns a dictionary of column lists."""
+        slices = self._get_field_slices()
+        fields = [field for field, _, _ in slices]
+        parse_functions = self._make_parse_functions(memofile, fields)
+        unpack = self._make_unpack(slices)
+
+        def decode_columns(batch):
+            if batch:
+                raw_columns = zip(*map(unpack, batch))
             else:
-                field_parser = self.parserclass(self, memofile)
-                parse = field_parser.parse
-
-            # Shortcuts for speed.
-            skip_record = self._skip_record
-            read = infile.read
-
-            while True:
-                sep = read(1)
-
-                if sep == record_type:
-                    items = [
-                        (field.name, parse(field, read(field.length)))
-                        for field in self.fields
-                    ]
-                    yield self.recfactory(items)
-
-                elif sep in (b'\x1a', b''):
-                    # End of records.
-                    break
-                else:
-                    skip_record(infile)
+                raw_columns = [()] * len(slices)
+
+            columns = ORDERED_DICT()
+            for field, parse, raw_column in zip(fields, parse_functions,
+                                                raw_columns):
+                columns[field.name] = [parse(field, data)
+                                       for data in raw_column]
+            return columns
+
+        return decode_columns
+
+    def _count_decoded(self, decode, batch=False):
+        if self.stats is None:
+            return decode
+        else:
+            return self.stats.wrap_decode(decode, batch)
+
+    def _iter_matching_data(self, infile, record_type, match,
+                            start=0, stop=None):
+        for data in self._iter_record_data(infile, start, stop):
+            if data[:1] == record_type:
+                if match is None or match(data):
+                    yield data
+
+    def _iter_records(self, record_type=b' ', start=0, stop=None):
+        slices = self._get_field_slices() + self._get_where_slices()
+        with self._open_table_file() as infile, \
+             self._open_memofile(slices) as memofile:
+
+            decode = self._count_decoded(self._make_decode(memofile))
+            match = self._make_match(memofile)
+
+            for data in self._iter_matching_data(infile, record_type, match,
+                                                 start, stop):
+                yield decode(data)
+
+    def iter_all(self):
+        """Yield (is_deleted, record) for all records in file order.
+
+        This reads the file once and returns both records and deleted
+        records.
+        """
+        slices = self._get_field_slices() + self._get_where_slices()
+        with self._open_table_file() as infile, \
+             self._open_memofile(slices) as memofile:
+
+            decode = self._count_decoded(self._make_decode(memofile))
+            match = self._make_match(memofile)
+
+            for data in self._iter_record_data(infile):
+                flag = data[:1]
+                if flag == b' ' or flag == b'*':
+                    if match is None or match(data):
+                        yield flag == b'*', decode(data)
+
+    def iter_batches(self, size=1000, layout='rows', deleted=False):
+        """Yield records in batches of up to size records.
+
+        With layout='rows' each batch is a list of records. With
+        layout='columns' each batch is a dictionary of field names and
+        lists of values. If deleted is True deleted records are
+        returned instead.
+        """
+        if size < 1:
+            raise ValueError('size must be at least 1')
+        elif layout not in ('rows', 'columns'):
+            raise ValueError('layout must be \'rows\' or \'columns\'')
+
+        record_type = b'*' if deleted else b' '
+        return self._iter_batches(record_type, size, layout)
+
+    def _iter_batches(self, record_type, size, layout):
+        slices = self._get_field_slices() + self._get_where_slices()
+        with self._open_table_file() as infile, \
+             self._open_memofile(slices) as memofile:
+
+            if layout == 'rows':
+                decode = self._make_decode(memofile)
+
+                def decode_batch(batch):
+                    return [decode(data) for data in batch]
+            else:
+                decode_batch = self._make_decode_columns(memofile)
+            decode_batch = self._count_decoded(decode_batch, batch=True)
+
+            match = self._make_match(memofile)
+            batch = []
+            for data in self._iter_matching_data(infile, record_type, match):
+                batch.append(data)
+                if len(batch) == size:
+                    yield decode_batch(batch)
+                    batch = []
+
+            if batch:
+                yield decode_batch(batch)
+
+    def _open_mmap(self):
+        if self._mmap is None:
+            with open(self.filename, 'rb') as infile:
+                self._mmap = mmap.mmap(infile.fileno(), 0,
+                                       access=mmap.ACCESS_READ)
+            self._mmap_count = max(0, len(self._mmap) - self.header.headerlen)
+            self._mmap_count //= self.header.recordlen
+            self._mmap_memofile = self._open_memofile()
+            self._mmap_decode = self._make_decode(self._mmap_memofile)
+        return self._mmap
+
+    def _get_record_data(self, index):
+        mm = self._open_mmap()
+
+        if index < 0:
+            index += self._mmap_count
+        if not 0 <= index < self._mmap_count:
+            raise IndexError('record index out of range')
+
+        start = self.header.headerlen + index * self.header.recordlen
+        return mm[start:start + self.header.recordlen]
+
+    def get_record(self, index):
+        """Return record number index.
+
+        Records are numbered from 0 in the order they appear in the
+        file, and deleted records are included. The record is read
+        directly from a memory map of the file, so this takes the same
+        time for every record. Negative numbers count from the end.
+        """
+        data = self._get_record_data(index)
+        return self._mmap_decode(data)
+
+    def is_deleted(self, index):
+        """Return True if record number index is marked as deleted."""
+        return self._get_record_data(index)[:1] == b'*'
+
+    def _get_records(self, indexes):
+        """Yield the records with these numbers that are not deleted."""
+        for index in indexes:
+            data = self._get_record_data(index)
+            if data[:1] == b' ':
+                yield self._mmap_decode(data)
+
+    def _load_indexes(self):
+        if self._indexes is None:
+            self._indexes = {}
+            filename = find_structural_index(self.filename)
+            if filename:
+                self.open_index(filename)
+
+    def open_index(self, filename):
+        """Open an index file so it can be used by lookup() and range().
+
+        The tags in a .cdx file are available by tag name. .ndx and
+        .idx files are available by the file name without extension.
+        The structural .cdx file is opened automatically.
+        """
+        if self._indexes is None:
+            self._load_indexes()
+
+        index = open_index(filename, self.encoding, self)
+        if isinstance(index, CDXFile):
+            for name in index:
+                self._indexes[name] = index[name]
+        else:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            self._indexes[name.upper()] = index
+        return index
+
+    def get_index(self, tag):
+        """Return the index with this tag name (case insensitive)."""
+        self._load_indexes()
+        try:
+            return self._indexes[tag.upper()]
+        except KeyError:
+            raise ValueError('Unknown index tag: {!r}'.format(tag))
+
+    def lookup(self, tag, key):
+        """Return a list of records where the index key is equal to key.
+
+        Only the index nodes and records that are needed are read.
+        Deleted records are left out.
+        """
+        return list(self._get_records(self.get_index(tag).lookup(key)))
+
+    def range(self, tag, low=None, high=None):
+        """Yield records with index keys from low to high (inclusive)
+        in index order.
+
+        Either end can be None. Deleted records are left out.
+        """
+        return self._get_records(self.get_index(tag).iter_range(low, high))
+
+    def _get_index_field(self, field_name):
+        """Return (field, start, end) for a field that can be indexed."""
+        slices = self._get_field_slices([field_name])
+        if self._needs_memofile(slices):
+            raise ValueError('Memo fields can not be indexed: {!r}'.format(
+                field_name))
+        return slices[0]
+
+    def _get_key_index_filename(self, field):
+        return '{}.{}.dbfx'.format(self.filename, field)
+
+    def build_index(self, field, path=None):
+        """Build an index file for finding records by field with find().
+
+        The default path is the table file name followed by the field
+        name and ".dbfx". Returns the path.
+        """
+        if path is None:
+            path = self._get_key_index_filename(field)
+        field_info, start, end = self._get_index_field(field)
+
+        # Taken before the records are read so any change while
+        # reading makes the index out of date.
+        stamp = get_stamp(self.filename)
+        parse = self._make_parse(None)
+        with open(self.filename, 'rb') as infile:
+            records = enumerate(self._iter_record_data(infile))
+            items = [(recno, parse(field_info, data[start:end]))
+                     for recno, data in records if data[:1] == b' ']
+        write_key_index(path, field, stamp, items)
+
+        self._key_indexes[field] = KeyIndex(path)
+        return path
+
+    def _get_key_index(self, field):
+        index = self._key_indexes.get(field)
+        if index is None:
+            path = self._get_key_index_filename(field)
+            if not os.path.exists(path):
+                raise ValueError('No index for field {!r}'
+                                 ' (use build_index() to create one)'.format(
+                                     field))
+            index = KeyIndex(path)
+            if not index.is_for(field):
+                raise ValueError('{!r} is not an index for field {!r}'.format(
+                    path, field))
+            self._key_indexes[field] = index
+
+        if not index.is_current(self.filename):
+            # The table has changed. Records may have moved so the
+            # memory map is reopened as well.
+            self.close()
+            self.build_index(field, index.filename)
+            index = self._key_indexes[field]
+        return index
+
+    def find(self, field, value):
+        """Return a list of records where field is equal to value.
+
+        This uses the index file made by build_index(). If the table
+        has changed since then the index is built again first. Deleted
+        records are left out.
+        """
+        index = self._get_key_index(field)
+        field_info, start, end = self._get_index_field(field)
+        parse = self._make_parse(None)
+
+        records = []
+        for recno in index.iter_candidates(value):
+            data = self._get_record_data(recno)
+            if data[:1] == b' ' \
+                    and parse(field_info, data[start:end]) == value:
+                records.append(self._mmap_decode(data))
+        return records
+
+    def close(self):
+        """Close the memory map and memo file used for random access
+        and lazy memos, and the index files.
+
+        They will be reopened if needed.
+        """
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap_memofile.__exit__(None, None, None)
+            self._mmap = None
+            self._mmap_count = 0
+            self._mmap_memofile = None
+            self._mmap_decode = None
+
+        if self._memofile is not None:
+            self._memofile.__exit__(None, None, None)
+            self._memofile = None
+
+        if self._indexes:
+            for index in self._indexes.values():
+                index.close()
+
+    def to_numpy(self, columns=None):
+        """Return records as a NumPy structured array.
+
+        Deleted records are left out. columns overrides the columns
+        option. This requires NumPy.
+        """
+        from .numpy_export import to_numpy
+        return to_numpy(self, columns)
+
+    def iter_numpy(self, batch_size=65536, columns=None):
+        """Yield records as NumPy structured arrays of up to batch_size
+        records. This requires NumPy."""
+        from .numpy_export import iter_numpy
+        return iter_numpy(self, batch_size, columns)
+
+    def to_arrow(self, columns=None, dictionary=None):
+        """Return records as a pyarrow.Table.
+
+        Deleted records are left out. columns overrides the columns
+        option. Fields named in dictionary are dictionary encoded.
+        This requires pyarrow and NumPy.
+        """
+        from .arrow_export import to_arrow
+        return to_arrow(self, columns=columns, dictionary=dictionary)
+
+    def iter_arrow_batches(self, batch_size=65536, columns=None,
+                           dictionary=None):
+        """Yield records as pyarrow.RecordBatch objects of up to
+        batch_size records. This requires pyarrow and NumPy."""
+        from .arrow_export import iter_arrow_batches
+        return iter_arrow_batches(self, batch_size, columns, dictionary)
+
+    def arrow_schema(self, batch_size=65536, columns=None, dictionary=None):
+        """Return the pyarrow.Schema of the batches from
+        iter_arrow_batches(). This requires pyarrow and NumPy."""
+        from .arrow_export import arrow_schema
+        return arrow_schema(self, batch_size, columns, dictionary)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._open_mmap()
+            indices = range(*index.indices(self._mmap_count))
+            return [self.get_record(i) for i in indices]
+        else:
+            return self.get_record(index)
 
     def __iter__(self):
         if self.loaded:
@@ -352,4 +985,5 @@ class DBF(object):
 
     def __exit__(self, type, value, traceback):
         self.unload()
+        self.close()
         return False
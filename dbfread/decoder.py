@@ -0,0 +1,63 @@
+"""
+Record decoders compiled for a table.
+
+Instead of looping over the fields for every record the decoder is
+generated Python code with one line per field, for example::
+
+    def decode(data):
+        v0, v1 = unpack(data)
+        return {n0: p0(f0, v0), n1: p1(f1, v1)}
+
+where pN is the parse function for field fN (looked up once per
+table) and nN is the field name.
+"""
+import collections
+
+
+def _make_source(count, raw, recfactory):
+    values = ['v{}'.format(i) for i in range(count)]
+    if raw:
+        parsed = values
+    else:
+        parsed = ['p{0}(f{0}, v{0})'.format(i) for i in range(count)]
+
+    if recfactory is dict:
+        items = ', '.join('n{}: {}'.format(i, value)
+                          for i, value in enumerate(parsed))
+        record = '{{{}}}'.format(items)
+    else:
+        items = ''.join('(n{}, {}), '.format(i, value)
+                        for i, value in enumerate(parsed))
+        if recfactory is list:
+            record = '[{}]'.format(items)
+        elif recfactory is collections.OrderedDict:
+            record = 'recfactory(({}))'.format(items)
+        else:
+            record = 'recfactory([{}])'.format(items)
+
+    lines = ['def decode(data):']
+    if count:
+        lines.append('    {}, = unpack(data)'.format(', '.join(values)))
+    lines.append('    return {}'.format(record))
+    return '\n'.join(lines) + '\n'
+
+
+def compile_decode(fields, parse_functions, unpack, recfactory):
+    """Return a function that takes record data and returns a record.
+
+    parse_functions is a list of functions to call as func(field, data)
+    for each field, or None to return the data as is. unpack(data) must
+    return the data for each field.
+    """
+    raw = parse_functions is None
+    namespace = {'unpack': unpack, 'recfactory': recfactory}
+    for i, field in enumerate(fields):
+        namespace['n{}'.format(i)] = field.name
+        namespace['f{}'.format(i)] = field
+        if not raw:
+            namespace['p{}'.format(i)] = parse_functions[i]
+
+    source = _make_source(len(fields), raw, recfactory)
+    code = compile(source, '<dbfread decoder>', 'exec')
+    exec(code, namespace)
+    return namespace['decode']
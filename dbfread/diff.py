@@ -0,0 +1,243 @@
+"""
+Find the records that have changed between two versions of a table.
+
+    >>> changes = diff(DBF('old/customers.dbf'), DBF('customers.dbf'),
+    ...                key='CUSTNO')
+    >>> changes.inserted
+    [1043, 1044]
+
+Records are compared by a hash of their raw data, so unchanged records
+are never parsed. Records are matched by record number, or by the
+value of a key field. A table can also be compared with a fingerprint
+file saved earlier, so the old version of the table doesn't need to
+be kept:
+
+    >>> Fingerprint.from_table(table, key='CUSTNO').save('customers.fp')
+    ... (later)
+    >>> changes = diff(Fingerprint.load('customers.fp'), DBF(...))
+
+Memo fields hold the position of the memo in the memo file, so a memo
+that is changed in place without moving it is not noticed.
+"""
+import struct
+import hashlib
+from functools import partial
+
+from .dbf import DBF
+
+MAGIC = b'DBFREADF'
+VERSION = 1
+
+# Magic, version, key field name and number of entries.
+FingerprintHeader = struct.Struct('<8sL11sL')
+# Record number, deletion flag, digest and length of the key data.
+EntryHeader = struct.Struct('<Lc8sH')
+
+
+def _digest(data):
+    return hashlib.sha1(data).digest()[:8]
+
+
+class Fingerprint(object):
+    """Hashes of the records of a table.
+
+    key is the name of the field used to match records, or None to use
+    record numbers. entries is a dictionary of (record number,
+    is_deleted, digest) by record number or raw key data.
+    """
+    def __init__(self, key=None, entries=None, parse_key=None):
+        self.key = key
+        self.entries = entries if entries is not None else {}
+        self._parse_key = parse_key
+
+    @classmethod
+    def from_table(cls, table, key=None):
+        """Read the table and hash each record.
+
+        Raises ValueError if two records that are not deleted have the
+        same key.
+        """
+        entries = {}
+        parse_key = None
+        if key is not None:
+            field, start, end = table._get_index_field(key)
+            parse_key = partial(table._make_parse(None), field)
+
+        with open(table.filename, 'rb') as infile:
+            for recno, data in enumerate(table._iter_record_data(infile)):
+                deleted = data[:1] == b'*'
+                entry = (recno, deleted, _digest(data[1:]))
+                if key is None:
+                    entries[recno] = entry
+                else:
+                    key_data = data[start:end]
+                    # Prefer live records when a deleted record has the
+                    # same key.
+                    other = entries.get(key_data)
+                    if other is None or other[1]:
+                        entries[key_data] = entry
+                    elif not deleted:
+                        raise ValueError(
+                            'Duplicate key {!r} in records {} and {}'.format(
+                                parse_key(key_data), other[0], recno))
+
+        return cls(key, entries, parse_key)
+
+    def save(self, filename):
+        """Save the fingerprint to a file."""
+        name = (self.key or '').encode('utf-8')[:11]
+        parts = [FingerprintHeader.pack(MAGIC, VERSION, name,
+                                        len(self.entries))]
+        for key_data, (recno, deleted, digest) in self.entries.items():
+            if self.key is None:
+                key_data = b''
+            flag = b'*' if deleted else b' '
+            parts.append(EntryHeader.pack(recno, flag, digest,
+                                          len(key_data)))
+            parts.append(key_data)
+
+        with open(filename, 'wb') as outfile:
+            outfile.write(b''.join(parts))
+
+    @classmethod
+    def load(cls, filename):
+        """Load a fingerprint saved with save().
+
+        Keys are returned as raw data unless the fingerprint is compared
+        with a table.
+        """
+        with open(filename, 'rb') as infile:
+            data = infile.read()
+
+        try:
+            magic, version, name, count = FingerprintHeader.unpack_from(data)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a dbfread fingerprint file: {!r}'.format(
+                filename))
+
+        name = name.rstrip(b'\0').decode('utf-8')
+        key = name or None
+
+        entries = {}
+        pos = FingerprintHeader.size
+        for _ in range(count):
+            if pos + EntryHeader.size > len(data):
+                raise ValueError('Fingerprint file is truncated: {!r}'.format(
+                    filename))
+            recno, flag, digest, size = EntryHeader.unpack_from(data, pos)
+            pos += EntryHeader.size
+            if pos + size > len(data):
+                raise ValueError('Fingerprint file is truncated: {!r}'.format(
+                    filename))
+            entry = (recno, flag == b'*', digest)
+            if key is None:
+                entries[recno] = entry
+            else:
+                entries[data[pos:pos + size]] = entry
+                pos += size
+
+        return cls(key, entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __repr__(self):
+        return '<Fingerprint key={!r} with {} records>'.format(
+            self.key, len(self.entries))
+
+
+class TableDiff(object):
+    """Changes between two versions of a table.
+
+    inserted, updated, deleted and undeleted are lists of keys (record
+    numbers if no key field was used). record_numbers has the record
+    number in the new table for each changed key that is in it.
+    """
+    def __init__(self):
+        self.inserted = []
+        self.updated = []
+        self.deleted = []
+        self.undeleted = []
+        self.record_numbers = {}
+
+    def records(self, table, keys):
+        """Return the records for these keys from the new table."""
+        return [table.get_record(self.record_numbers[key]) for key in keys]
+
+    def __bool__(self):
+        return any([self.inserted, self.updated, self.deleted,
+                    self.undeleted])
+
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return ('<TableDiff {} inserted, {} updated, {} deleted,'
+                ' {} undeleted>'.format(len(self.inserted),
+                                        len(self.updated),
+                                        len(self.deleted),
+                                        len(self.undeleted)))
+
+
+def _get_fingerprint(table, key):
+    if isinstance(table, DBF):
+        return Fingerprint.from_table(table, key)
+    elif table.key != key:
+        raise ValueError('Fingerprint has key {!r}, not {!r}'.format(
+            table.key, key))
+    else:
+        return table
+
+
+def _raw_key(data):
+    return data
+
+
+def _by_recno(entries):
+    return sorted(entries.items(), key=lambda item: item[1][0])
+
+
+def _get_change(old_entry, deleted, digest):
+    """Return the name of the change to a record, or None."""
+    if old_entry is None:
+        return None if deleted else 'inserted'
+
+    _, old_deleted, old_digest = old_entry
+    if old_deleted:
+        return None if deleted else 'undeleted'
+    elif deleted:
+        return 'deleted'
+    elif digest != old_digest:
+        return 'updated'
+    else:
+        return None
+
+
+def diff(old, new, key=None):
+    """Compare two versions of a table and return a TableDiff.
+
+    old and new are DBF objects or Fingerprint objects. key is the name
+    of the field used to match records, or None to use record numbers.
+    If old is a Fingerprint, key is taken from it.
+    """
+    if key is None and isinstance(old, Fingerprint):
+        key = old.key
+    old = _get_fingerprint(old, key)
+    new = _get_fingerprint(new, key)
+
+    parse_key = new._parse_key or old._parse_key or _raw_key
+
+    changes = TableDiff()
+    for key_data, (recno, deleted, digest) in _by_recno(new.entries):
+        change = _get_change(old.entries.get(key_data), deleted, digest)
+        if change is not None:
+            value = parse_key(key_data)
+            getattr(changes, change).append(value)
+            changes.record_numbers[value] = recno
+
+    for key_data, (_, deleted, _) in _by_recno(old.entries):
+        if not deleted and key_data not in new.entries:
+            changes.deleted.append(parse_key(key_data))
+
+    return changes
@@ -5,7 +5,7 @@ import sys
 import datetime
 import struct
 from decimal import Decimal
-from .memo import BinaryMemo
+from .memo import BinaryMemo, LazyMemo
 
 PY2 = sys.version_info[0] == 2
 
@@ -15,6 +15,11 @@ else:
     decode_text = str
 
 
+def _function(method):
+    """Return the plain function behind a method."""
+    return getattr(method, '__func__', method)
+
+
 class InvalidValue(bytes):
     def __repr__(self):
         text = bytes.__repr__(self)
@@ -36,6 +41,8 @@ class FieldParser:
         self.dbversion = self.table.header.dbversion
         self.encoding = table.encoding
         self.char_decode_errors = table.char_decode_errors
+        # Table objects made for older versions don't have numeric_mode.
+        self.numeric_mode = getattr(table, 'numeric_mode', 'auto')
         self._lookup = self._create_lookup_table()
         if memofile:
             self.get_memo = memofile.__getitem__
@@ -70,6 +77,44 @@ class FieldParser:
         """
         return field_type in self._lookup
 
+    def uses_default_parser(self, field_type):
+        """Checks if the field type is parsed by FieldParser's own method
+
+        Returns False if a subclass overrides parse() or the parse
+        method for this field type. Code that decodes values in bulk
+        uses this to decide when it's safe to bypass the parser.
+        """
+        func = self._lookup.get(field_type)
+        if func is None:
+            return False
+        elif self._overrides_parse():
+            return False
+        else:
+            default = getattr(FieldParser, func.__name__, None)
+            return _function(func) is _function(default)
+
+    def _overrides_parse(self):
+        # self.__class__ since type(self) is 'instance' for old style
+        # classes in Python 2.
+        method = self.__class__.parse
+        return _function(method) is not _function(FieldParser.parse)
+
+    def get_parse_function(self, field):
+        """Return the function that parses this field
+
+        The function is called as func(field, data). If a subclass
+        overrides parse() that is returned instead, so it's still used
+        for all fields. Code that parses many records uses this to look
+        up the function once instead of once for every value.
+        """
+        if self._overrides_parse():
+            return self.parse
+        elif field.type == 'N' and self.uses_default_parser('N'):
+            return self._get_number_parser(field)
+        else:
+            # parse() raises ValueError for unknown field types.
+            return self._lookup.get(field.type, self.parse)
+
     def parse(self, field, data):
         """Parse field and return value"""
         try:
@@ -147,6 +192,14 @@ class FieldParser:
         the corresponding memo in the memo file.
         """
         memo = self.get_memo(self._parse_memo_index(data))
+        if isinstance(memo, LazyMemo):
+            # Decode it when it's read.
+            memo.decode = self._decode_memo
+            return memo
+        else:
+            return self._decode_memo(memo)
+
+    def _decode_memo(self, memo):
         # Visual FoxPro allows binary data in memo fields.
         # These should not be decoded as string.
         if isinstance(memo, BinaryMemo):
@@ -160,8 +213,32 @@ class FieldParser:
     def parseN(self, field, data):
         """Parse numeric field (N)
 
-        Returns int, float or None if the field is empty.
+        Returns int, float or None if the field is empty. With
+        numeric_mode='float' or 'decimal' the type is decided by the
+        field's decimal count, see _get_number_parser().
+        """
+        if self.numeric_mode == 'auto':
+            return self._parse_number(field, data)
+        else:
+            return self._get_number_parser(field)(field, data)
+
+    def _get_number_parser(self, field):
+        """Return the function that parses this numeric field
+
+        In 'auto' mode the type is decided by the value. Otherwise
+        fields with no decimals are returned as int and other fields as
+        float or Decimal depending on numeric_mode.
         """
+        if self.numeric_mode == 'auto':
+            return self._parse_number
+        elif field.decimal_count == 0:
+            return self._parse_int
+        elif self.numeric_mode == 'float':
+            return self._parse_float
+        else:
+            return self._parse_decimal
+
+    def _parse_number(self, field, data):
         # In some files * is used for padding.
         data = data.strip().strip(b'*\0')
 
@@ -174,6 +251,54 @@ class FieldParser:
                 # Account for , in numeric fields
                 return float(data.replace(b',', b'.'))
 
+    def _clean_number(self, data):
+        """Return number data without padding, or None if it's blank."""
+        # In some files * is used for padding.
+        data = data.strip().strip(b'*\0').strip()
+        if data:
+            # Account for , in numeric fields
+            return data.replace(b',', b'.')
+        else:
+            return None
+
+    def _parse_int(self, field, data):
+        try:
+            return int(data)
+        except ValueError:
+            data = self._clean_number(data)
+            if data is None:
+                return None
+
+            try:
+                return int(data)
+            except ValueError:
+                raise ValueError(
+                    'Invalid integer value: {!r}'.format(data))
+
+    def _parse_float(self, field, data):
+        try:
+            return float(data)
+        except ValueError:
+            data = self._clean_number(data)
+            if data is None:
+                return None
+            else:
+                return float(data)
+
+    def _parse_decimal(self, field, data):
+        try:
+            return Decimal(data.decode('ascii'))
+        except (ArithmeticError, UnicodeDecodeError):
+            data = self._clean_number(data)
+            if data is None:
+                return None
+
+            try:
+                return Decimal(data.decode('ascii'))
+            except (ArithmeticError, UnicodeDecodeError):
+                raise ValueError(
+                    'Invalid numeric value: {!r}'.format(data))
+
     def parseO(self, field, data):
         """Parse long field (O) and return float."""
         return struct.unpack('d', data)[0]
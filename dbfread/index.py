@@ -0,0 +1,409 @@
+"""
+Read index files.
+
+Supported formats:
+
+    NDX    dBase III (one index per file)
+    IDX    FoxPro (one index per file, compact or not)
+    CDX    FoxPro compound index (one or more named tags per file)
+
+Indexes are B-trees of keys and record numbers. Only the nodes needed
+to find a key are read. Record numbers returned by these classes
+start at 0, like in DBF.get_record().
+
+The index file is opened on the first read and kept open until
+close() is called. It will be reopened if needed.
+
+dBase IV MDX files are not supported.
+
+Character keys are compared as bytes, so FoxPro indexes must use the
+MACHINE collation sequence for lookups to work.
+"""
+import struct
+import datetime
+
+from .ifiles import ifind
+
+text_type = type(u'')
+
+NDXHeader = struct.Struct('<LL4xHHHH')
+CompactHeader = struct.Struct('<liiHBB')
+CompactLeafHeader = struct.Struct('<HHiiHLBBBBBB')
+NodeHeader = struct.Struct('<HHii')
+
+# Julian day number of datetime.date(1, 1, 1) minus 1.
+JULIAN_ORDINAL = 1721425
+
+# Index option flags in FoxPro index headers.
+UNIQUE = 0x01
+FOR_CLAUSE = 0x08
+COMPACT = 0x20
+COMPOUND = 0x40
+
+# Node attribute flags in FoxPro index nodes.
+LEAF = 0x02
+
+# Functions that return strings in key expressions.
+TEXT_FUNCTIONS = ('UPPER(', 'LOWER(', 'DTOS(', 'STR(', 'LEFT(', 'RIGHT(',
+                  'SUBSTR(', 'PADR(', 'PADL(', 'ALLTRIM(', 'TRIM(',
+                  'TRANSFORM(')
+
+
+def _julian_day(date):
+    return date.toordinal() + JULIAN_ORDINAL
+
+
+def _to_number(value):
+    """Return a date or number as a float. Dates are Julian day numbers."""
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    if isinstance(value, datetime.date):
+        return float(_julian_day(value))
+    else:
+        return float(value)
+
+
+class Index(object):
+    """Base class for indexes.
+
+    Subclasses implement _read_node(pos) which returns (is_leaf,
+    entries). For leaf nodes entries is a list of (key, record number)
+    and for other nodes (key, child position) where key is the largest
+    key in the child (or None for the last child in NDX files).
+    """
+    #: Name of the index (the tag name or the file name).
+    name = None
+
+    #: Key expression as a string.
+    expression = None
+
+    #: True if the key is text.
+    text = True
+
+    #: Length of keys in bytes.
+    keylen = 0
+
+    #: Position of the root node.
+    root = 0
+
+    descending = False
+
+    def __init__(self, filename, encoding='ascii'):
+        self.filename = filename
+        self.encoding = encoding
+        self._file = None
+
+    def _read(self, pos, size):
+        if self._file is None:
+            self._file = open(self.filename, 'rb')
+        self._file.seek(pos)
+        return self._file.read(size)
+
+    def close(self):
+        """Close the index file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+        return False
+
+    def _read_node(self, pos):
+        raise NotImplementedError
+
+    def _encode_text(self, value):
+        if isinstance(value, text_type):
+            value = value.encode(self.encoding)
+        return value[:self.keylen].ljust(self.keylen)
+
+    def encode_key(self, value):
+        """Return value as it's compared with keys in the index."""
+        raise NotImplementedError
+
+    def _decode_key(self, data):
+        """Return key data from the file in comparable form."""
+        return data
+
+    def _iter_entries(self, pos, low):
+        """Yield (key, recno) for all entries with key >= low in order."""
+        is_leaf, entries = self._read_node(pos)
+        for key, pointer in entries:
+            if is_leaf:
+                if low is None or key >= low:
+                    yield key, pointer
+            elif key is None or low is None or key >= low:
+                for entry in self._iter_entries(pointer, low):
+                    yield entry
+
+    def iter_range(self, low=None, high=None):
+        """Yield record numbers with keys from low to high (inclusive).
+
+        Either end can be None. Record numbers are yielded in key order.
+        """
+        if low is not None:
+            low = self.encode_key(low)
+        if high is not None:
+            high = self.encode_key(high)
+
+        if self.descending:
+            # Keys are stored in descending order. Read them all.
+            entries = sorted(self._iter_entries(self.root, None))
+            for key, recno in entries:
+                if (low is None or key >= low) and \
+                   (high is None or key <= high):
+                    yield recno - 1
+            return
+
+        for key, recno in self._iter_entries(self.root, low):
+            if high is not None and key > high:
+                return
+            yield recno - 1
+
+    def lookup(self, key):
+        """Return a list of record numbers with this key."""
+        return list(self.iter_range(key, key))
+
+    def __repr__(self):
+        return '<{} {!r} on {!r}>'.format(self.__class__.__name__,
+                                          self.name, self.expression)
+
+
+class NDXIndex(Index):
+    """dBase III index file."""
+    def __init__(self, filename, encoding='ascii'):
+        Index.__init__(self, filename, encoding)
+        header = self._read(0, 512)
+        (root, _, self.keylen, self.keys_per_node, key_type,
+         self.entry_size) = NDXHeader.unpack_from(header)
+        self.root = root * 512
+        self.text = key_type == 0
+        expression = header[24:].split(b'\0', 1)[0]
+        self.expression = expression.decode('ascii', 'replace').strip()
+        self.name = self.expression
+
+    def encode_key(self, value):
+        if self.text:
+            return self._encode_text(value)
+        else:
+            return _to_number(value)
+
+    def _decode_key(self, data):
+        if self.text:
+            return data
+        else:
+            return struct.unpack('<d', data[:8])[0]
+
+    def _read_node(self, pos):
+        node = self._read(pos, 512)
+        count = struct.unpack_from('<L', node)[0]
+        keylen = self.keylen
+
+        entries = []
+        is_leaf = True
+        for i in range(count + 1):
+            offset = 4 + i * self.entry_size
+            child, recno = struct.unpack_from('<LL', node, offset)
+            if i == 0:
+                is_leaf = child == 0
+
+            if i == count:
+                # Interior nodes have one more child than keys.
+                if not is_leaf:
+                    entries.append((None, child * 512))
+            elif is_leaf:
+                key = node[offset + 8:offset + 8 + keylen]
+                entries.append((self._decode_key(key), recno))
+            else:
+                key = node[offset + 8:offset + 8 + keylen]
+                entries.append((self._decode_key(key), child * 512))
+
+        return is_leaf, entries
+
+
+class FoxProIndex(Index):
+    """FoxPro index (an IDX file or a tag in a CDX file).
+
+    pos is the position of the index header in the file.
+    """
+    def __init__(self, filename, encoding='ascii', pos=0, name=None,
+                 table=None):
+        Index.__init__(self, filename, encoding)
+        header = self._read(pos, 1024)
+        (self.root, _, _, self.keylen, self.options,
+         _) = CompactHeader.unpack_from(header)
+        self.compact = bool(self.options & COMPACT)
+        self.unique = bool(self.options & UNIQUE)
+        self.has_for_clause = bool(self.options & FOR_CLAUSE)
+
+        if self.compact:
+            self.descending = struct.unpack_from('<H', header, 0x1f6)[0] == 1
+            length = struct.unpack_from('<H', header, 0x1fe)[0]
+            expression = header[0x200:0x200 + length]
+        else:
+            expression = header[16:236]
+        expression = expression.split(b'\0', 1)[0]
+        self.expression = expression.decode('ascii', 'replace').strip()
+
+        self.name = name or self.expression
+        self.text = self._is_text(table)
+
+    def _is_text(self, table):
+        """Guess if the key is text from the key expression."""
+        expression = self.expression.upper()
+        if table is not None:
+            for field in table.fields:
+                if field.name.upper() == expression:
+                    return field.type in 'CV'
+
+        if expression.startswith(TEXT_FUNCTIONS) or '+' in expression:
+            return True
+        elif table is not None and self.keylen in (4, 8):
+            # Probably a number or date.
+            return False
+        else:
+            return True
+
+    def encode_key(self, value):
+        if self.text:
+            return self._encode_text(value)
+        elif self.keylen == 4:
+            # Integer with the sign bit flipped.
+            number = int(value)
+            return struct.pack('>L', (number + 0x80000000) & 0xffffffff)
+        else:
+            # Double where the bytes compare in the same order as the
+            # numbers.
+            number = _to_number(value)
+            data = bytearray(struct.pack('>d', number))
+            if number >= 0:
+                data[0] ^= 0x80
+            else:
+                data = bytearray(b ^ 0xff for b in data)
+            return bytes(data)
+
+    def _read_node(self, pos):
+        node = self._read(pos, 512)
+        attributes, count, _, _ = NodeHeader.unpack_from(node)
+        is_leaf = bool(attributes & LEAF)
+
+        if is_leaf and self.compact:
+            return True, self._read_compact_leaf(node)
+
+        entries = []
+        keylen = self.keylen
+        if self.compact:
+            # Key, record number and child position.
+            entry_size = keylen + 8
+        else:
+            # Key and record number (leaf) or child position.
+            entry_size = keylen + 4
+        for i in range(count):
+            offset = 12 + i * entry_size
+            key = node[offset:offset + keylen]
+            if self.compact:
+                recno, child = struct.unpack_from('>LL', node,
+                                                  offset + keylen)
+            else:
+                recno = child = struct.unpack_from('>L', node,
+                                                   offset + keylen)[0]
+            if is_leaf:
+                entries.append((key, recno))
+            else:
+                entries.append((key, child))
+        return is_leaf, entries
+
+    def _read_compact_leaf(self, node):
+        (_, count, _, _, _, recno_mask, dup_mask, trail_mask,
+         recno_bits, dup_bits, _,
+         info_size) = CompactLeafHeader.unpack_from(node)
+
+        keylen = self.keylen
+        pad = b' ' if self.text else b'\0'
+        pos = len(node)
+        key = b''
+
+        entries = []
+        for i in range(count):
+            offset = CompactLeafHeader.size + i * info_size
+            info = node[offset:offset + info_size]
+            info = struct.unpack('<Q', info.ljust(8, b'\0'))[0]
+
+            recno = info & recno_mask
+            dup = (info >> recno_bits) & dup_mask
+            trail = (info >> (recno_bits + dup_bits)) & trail_mask
+
+            # Keys are stored from the end of the node without the
+            # bytes shared with the previous key or the trailing pad.
+            size = keylen - dup - trail
+            pos -= size
+            key = key[:dup] + node[pos:pos + size] + pad * trail
+            entries.append((key, recno))
+
+        return entries
+
+
+class CDXFile(object):
+    """FoxPro compound index file.
+
+    Tags are available by name (case insensitive) as a dictionary.
+    """
+    def __init__(self, filename, encoding='ascii', table=None):
+        self.filename = filename
+        self.tags = {}
+        with FoxProIndex(filename, encoding) as directory:
+            directory.text = True
+            for key, pos in directory._iter_entries(directory.root, None):
+                name = key.rstrip(b'\0 ').decode('ascii', 'replace')
+                self.tags[name.upper()] = FoxProIndex(
+                    filename, encoding, pos, name, table)
+
+    def __getitem__(self, name):
+        return self.tags[name.upper()]
+
+    def __contains__(self, name):
+        return name.upper() in self.tags
+
+    def __iter__(self):
+        return iter(self.tags)
+
+    def close(self):
+        """Close the index file for all tags."""
+        for tag in self.tags.values():
+            tag.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+        return False
+
+    def __repr__(self):
+        return '<CDXFile {!r} tags {}>'.format(self.filename,
+                                               sorted(self.tags))
+
+
+def open_index(filename, encoding='ascii', table=None):
+    """Open an index file.
+
+    Returns a CDXFile for .cdx files and an Index for .ndx and .idx
+    files. table is used to find the types of keys in FoxPro indexes.
+    """
+    ext = filename.lower().rsplit('.', 1)[-1]
+    if ext == 'ndx':
+        return NDXIndex(filename, encoding)
+    elif ext == 'idx':
+        return FoxProIndex(filename, encoding, table=table)
+    elif ext == 'cdx':
+        return CDXFile(filename, encoding, table)
+    else:
+        raise ValueError('unsupported index file {!r}'.format(filename))
+
+
+def find_structural_index(dbf_filename):
+    """Return the name of the .cdx file for a table, or None."""
+    return ifind(dbf_filename, ext='.cdx')
@@ -0,0 +1,149 @@
+"""
+Index files built by dbfread for looking up records by field value.
+
+    >>> table.build_index('CUSTNO')
+    >>> table.find('CUSTNO', 1234)
+
+The index file has a 32 bit hash of the value of each record and the
+record number, sorted by hash. A lookup is a binary search for the
+hash followed by reading the records with that hash directly. These
+records are parsed and compared with the value, so hash collisions
+never give wrong results.
+
+The size, modification time and number of records of the DBF file
+are stored in the index. If any of these change the index is out of
+date.
+"""
+import os
+import zlib
+import struct
+import bisect
+import numbers
+
+MAGIC = b'DBFREADX'
+VERSION = 1
+
+# Magic, version, DBF file size, DBF modification time, number of
+# records in the DBF header, number of entries and field name.
+KeyIndexHeader = struct.Struct('<8sLQdLL11s')
+# Hash and record number.
+Entry = struct.Struct('<LL')
+
+text_type = type(u'')
+
+
+def _key_data(value):
+    """Return value as bytes that are the same for all equal values."""
+    if value is None:
+        return b'0'
+    elif isinstance(value, bool):
+        return b'?1' if value else b'?0'
+    elif isinstance(value, text_type):
+        return b'u' + value.encode('utf-8')
+    elif isinstance(value, bytes):
+        return b'b' + value
+    elif isinstance(value, numbers.Number):
+        # 1, 1.0 and Decimal('1.0') are equal.
+        try:
+            if value == int(value):
+                return b'n' + str(int(value)).encode('ascii')
+        except (OverflowError, ValueError):
+            # Infinity or NaN.
+            pass
+        return b'n' + repr(float(value)).encode('ascii')
+    else:
+        return b'r' + repr(value).encode('utf-8')
+
+
+def key_hash(value):
+    """Return a hash of value that is the same in every process."""
+    return zlib.crc32(_key_data(value)) & 0xffffffff
+
+
+def get_stamp(filename):
+    """Return (size, modification time, number of records) of a DBF
+    file."""
+    stat = os.stat(filename)
+    with open(filename, 'rb') as infile:
+        numrecords = struct.unpack('<L', infile.read(8)[4:8])[0]
+    return (stat.st_size, stat.st_mtime, numrecords)
+
+
+def _encode_name(name):
+    return name.encode('utf-8')[:11]
+
+
+def write_key_index(filename, field_name, stamp, items):
+    """Write an index file.
+
+    items is an iterable of (record number, value). stamp is the
+    return value of get_stamp() from before the records were read.
+    """
+    entries = sorted((key_hash(value), recno) for recno, value in items)
+
+    size, mtime, numrecords = stamp
+    header = KeyIndexHeader.pack(MAGIC, VERSION, size, mtime, numrecords,
+                                 len(entries), _encode_name(field_name))
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(header)
+        outfile.write(b''.join([Entry.pack(*entry) for entry in entries]))
+
+
+class KeyIndex(object):
+    """Index file written by write_key_index().
+
+    The entries are read into memory once and searched from there.
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        with open(filename, 'rb') as infile:
+            self._data = infile.read()
+
+        if len(self._data) >= KeyIndexHeader.size:
+            (magic, version, size, mtime, numrecords, self.count,
+             field_name) = KeyIndexHeader.unpack_from(self._data)
+        else:
+            magic = version = None
+
+        if magic != MAGIC or version != VERSION \
+                or len(self._data) < self._offset(self.count):
+            raise ValueError('Not a dbfread index file: {!r}'.format(
+                filename))
+
+        self.stamp = (size, mtime, numrecords)
+        self._field_name = field_name.rstrip(b'\0')
+
+    def _offset(self, i):
+        return KeyIndexHeader.size + i * Entry.size
+
+    def is_for(self, field_name):
+        """Return True if the index was built for this field."""
+        return self._field_name == _encode_name(field_name)
+
+    def is_current(self, dbf_filename):
+        """Return True if the DBF file has not changed since the index
+        was built."""
+        return self.stamp == get_stamp(dbf_filename)
+
+    # The index is a sequence of hashes for bisect.
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return Entry.unpack_from(self._data, self._offset(i))[0]
+
+    def iter_candidates(self, value):
+        """Yield the numbers of the records that may have this value."""
+        key = key_hash(value)
+        i = bisect.bisect_left(self, key)
+        while i < self.count:
+            entry_key, recno = Entry.unpack_from(self._data, self._offset(i))
+            if entry_key != key:
+                break
+            yield recno
+            i += 1
+
+    def __repr__(self):
+        return '<KeyIndex {!r} with {} entries>'.format(self.filename,
+                                                        self.count)
@@ -8,6 +8,10 @@ VFP == Visual FoxPro
 DB3 == dBase III
 DB4 == dBase IV
 """
+import os
+import mmap
+import collections
+
 from .ifiles import ifind
 from .struct_parser import StructParser
 
@@ -61,27 +65,206 @@ VFP_TYPE_MAP = {
 }
 
 
+class LazyMemo(object):
+    """A memo that is not read until it's used.
+
+    The memo is read from the memo file the first time value is
+    accessed. decode is called on the memo before it's returned.
+    """
+    __slots__ = ['index', 'decode', '_get_memofile', '_value']
+
+    def __init__(self, get_memofile, index, decode=None):
+        self.index = index
+        self.decode = decode
+        self._get_memofile = get_memofile
+        self._value = _NOT_READ
+
+    @property
+    def value(self):
+        if self._value is _NOT_READ:
+            memo = self._get_memofile()[self.index]
+            if self.decode is not None:
+                memo = self.decode(memo)
+            self._value = memo
+        return self._value
+
+    def iter_chunks(self, chunk_size=65536):
+        """Yield the raw memo data in chunks of up to chunk_size bytes.
+
+        The data is read directly from the memo file and is not decoded.
+        """
+        return self._get_memofile().iter_chunks(self.index, chunk_size)
+
+    def view(self):
+        """Return the raw memo data as a memoryview of the memo file.
+
+        The data is not copied or decoded.
+        """
+        return self._get_memofile().view(self.index)
+
+    def __repr__(self):
+        return '<LazyMemo {}>'.format(self.index)
+
+
+# Value of LazyMemo._value before the memo is read.
+_NOT_READ = object()
+
+
+class MemoCache(object):
+    """Least recently used cache of memos.
+
+    maxsize is the total number of bytes of memo data to keep. The
+    number of cache hits and misses are counted in hits and misses.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._memos = collections.OrderedDict()
+        # (size, mtime) of the memo file the memos were read from.
+        self._file_key = None
+
+    def __len__(self):
+        return len(self._memos)
+
+    def clear(self):
+        """Remove all memos. Hits and misses are not reset."""
+        self._memos.clear()
+        self.size = 0
+
+    def check_file(self, filename):
+        """Clear the cache if the memo file has changed."""
+        stat = os.stat(filename)
+        key = (filename, stat.st_size, stat.st_mtime)
+        if key != self._file_key:
+            self.clear()
+            self._file_key = key
+
+    def get(self, index, read):
+        """Return memo number index.
+
+        read(index) is called to read the memo if it's not in the cache.
+        """
+        memos = self._memos
+        try:
+            memo = memos.pop(index)
+        except KeyError:
+            self.misses += 1
+            memo = read(index)
+            size = len(memo) if memo is not None else 0
+            if size > self.maxsize:
+                return memo
+            self.size += size
+            while self.size > self.maxsize:
+                _, old = memos.popitem(last=False)
+                self.size -= len(old) if old is not None else 0
+        else:
+            self.hits += 1
+
+        # Put it at the end to mark it as most recently used.
+        memos[index] = memo
+        return memo
+
+    def __repr__(self):
+        return '<MemoCache {} memos, {}/{} bytes, {} hits, {} misses>'.format(
+            len(self._memos), self.size, self.maxsize, self.hits, self.misses)
+
+
 class MemoFile(object):
-    def __init__(self, filename):
+    """Base class for memo files.
+
+    The file is memory mapped. Subclasses implement _find_memo(),
+    which returns the position of a memo in the file.
+    """
+    def __init__(self, filename, cache=None):
         self.filename = filename
+        self.cache = cache
         self._open()
         self._init()
+        if cache is not None:
+            cache.check_file(filename)
 
     def _init(self):
         pass
 
     def _open(self):
         self.file = open(self.filename, 'rb')
-        # Shortcuts for speed.
-        self._read = self.file.read
-        self._seek = self.file.seek
+        try:
+            self._data = mmap.mmap(self.file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be memory mapped.
+            self._data = b''
 
     def _close(self):
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # A memoryview from view() is still in use. The memory
+                # map will be closed when it's garbage collected.
+                pass
         self.file.close()
 
-    def __getitem__(self, index):
+    def _read_header(self, parser, pos):
+        return parser.unpack(self._data[pos:pos + parser.size])
+
+    def _find_memo(self, index):
+        """Return (start, end, memo_type) for memo number index.
+
+        start and end are positions in the file. memo_type is the
+        bytes subclass to return the memo as, or None.
+        """
         raise NotImplementedError
 
+    def __getitem__(self, index):
+        """Get a memo from the file."""
+        if index <= 0:
+            return None
+        elif self.cache is None:
+            return self._get_memo(index)
+        else:
+            return self.cache.get(index, self._get_memo)
+
+    def _get_memo(self, index):
+        start, end, memo_type = self._find_memo(index)
+        data = self._data[start:end]
+        if memo_type is None:
+            return data
+        else:
+            return memo_type(data)
+
+    def view(self, index):
+        """Return the raw data of a memo as a memoryview.
+
+        The data is not copied. The memory map stays open as long as
+        the memoryview is in use, even if the memo file is closed.
+
+        In Python 2 a memory map can't be used with memoryview, so the
+        memoryview is of a copy of the data.
+        """
+        if index <= 0:
+            return None
+
+        start, end, _ = self._find_memo(index)
+        end = max(start, end)
+        try:
+            return memoryview(self._data)[start:end]
+        except TypeError:
+            # Python 2.
+            return memoryview(self._data[start:end])
+
+    def iter_chunks(self, index, chunk_size=65536):
+        """Yield the raw data of a memo in chunks of up to chunk_size
+        bytes."""
+        if index <= 0:
+            return
+
+        start, end, _ = self._find_memo(index)
+        for pos in range(start, end, chunk_size):
+            yield self._data[pos:min(pos + chunk_size, end)]
+
     def __enter__(self):
         return self
 
@@ -100,71 +283,87 @@ class FakeMemoFile(MemoFile):
     _init = _close = _open
 
 
-class VFPMemoFile(MemoFile):
-    def _init(self):
-        self.header = VFPFileHeader.read(self.file)
+class LazyMemoFile(FakeMemoFile):
+    """Returns LazyMemo objects instead of reading memos.
+
+    get_memofile() must return the memo file to read them from.
+    """
+    def __init__(self, get_memofile):
+        FakeMemoFile.__init__(self, None)
+        self.get_memofile = get_memofile
 
     def __getitem__(self, index):
-        """Get a memo from the file."""
         if index <= 0:
             return None
+        else:
+            return LazyMemo(self.get_memofile, index)
+
 
-        self._seek(index * self.header.blocksize)
-        memo_header = VFPMemoHeader.read(self.file)
+class SharedMemoFile(FakeMemoFile):
+    """Reads memos from the memo file returned by get_memofile().
 
-        data = self._read(memo_header.length)
-        if len(data) != memo_header.length:
+    This is used when memos are read after the iteration is done.
+    """
+    def __init__(self, get_memofile):
+        FakeMemoFile.__init__(self, None)
+        self.get_memofile = get_memofile
+
+    def __getitem__(self, index):
+        return self.get_memofile()[index]
+
+
+class VFPMemoFile(MemoFile):
+    def _init(self):
+        self.header = self._read_header(VFPFileHeader, 0)
+
+    def _find_memo(self, index):
+        start = index * self.header.blocksize
+        memo_header = self._read_header(VFPMemoHeader, start)
+        start += VFPMemoHeader.size
+        end = start + memo_header.length
+        if end > len(self._data):
             raise IOError('EOF reached while reading memo')
 
-        return VFP_TYPE_MAP.get(memo_header.type, BinaryMemo)(data)
+        return start, end, VFP_TYPE_MAP.get(memo_header.type, BinaryMemo)
 
 
 class DB3MemoFile(MemoFile):
     """dBase III memo file."""
-    # Code from dbf.py
-    def __getitem__(self, index):
-        if index <= 0:
-            return None
-
-        block_size = 512
-        self._seek(index * block_size)
-        data = b''
-        while True:
-            newdata = self._read(block_size)
-            if not newdata:
-                return data
-            data += newdata
-
-            # Todo: some files (help.dbt) has only one field separator.
-            # Is this enough for all file though?
-            end_of_memo = data.find(b'\x1a')
-            if end_of_memo != -1:
-                return data[:end_of_memo]
+    def _find_memo(self, index):
+        start = index * 512
 
-            # Alternative end of memo markers:
-            # \x1a\x1a
-            # \x0d\x0a
+        # Todo: some files (help.dbt) has only one field separator.
+        # Is this enough for all file though?
+        #
+        # Alternative end of memo markers:
+        # \x1a\x1a
+        # \x0d\x0a
+        end = self._data.find(b'\x1a', start)
+        if end == -1:
+            end = len(self._data)
 
-        # TODO: this is never reached. Whey is it here?
-        # return data[:eom]
+        return start, end, None
 
 
 class DB4MemoFile(MemoFile):
     """dBase IV memo file"""
-    def __getitem__(self, index):
-        if index <= 0:
-            return None
-
+    def _find_memo(self, index):
         # Todo: read this from the file header.
         block_size = 512
 
-        self._seek(index * block_size)
-        memo_header = DB4MemoHeader.read(self.file)
-        data = self._read(memo_header.length)
+        start = index * block_size
+        memo_header = self._read_header(DB4MemoHeader, start)
+        start += DB4MemoHeader.size
+        end = min(start + memo_header.length, len(self._data))
+
         # Todo: fields are terminated in different ways.
         # \x1a is one of them
         # \x1f seems to be another (dbase_8b.dbt)
-        return data.split(b'\x1f', 1)[0]
+        terminator = self._data.find(b'\x1f', start, end)
+        if terminator != -1:
+            end = terminator
+
+        return start, end, None
 
 
 def find_memofile(dbf_filename):
@@ -176,12 +375,12 @@ def find_memofile(dbf_filename):
         return None
 
 
-def open_memofile(filename, dbversion):
+def open_memofile(filename, dbversion, cache=None):
     if filename.lower().endswith('.fpt'):
-        return VFPMemoFile(filename)
+        return VFPMemoFile(filename, cache)
     else:
         # print('######', dbversion)
         if dbversion == 0x83:
-            return DB3MemoFile(filename)
+            return DB3MemoFile(filename, cache)
         else:
-            return DB4MemoFile(filename)
+            return DB4MemoFile(filename, cache)
@@ -0,0 +1,336 @@
+"""
+Convert records to NumPy structured arrays.
+
+The record area of the file is memory mapped and viewed as a NumPy
+array with one column per field. Each column is then converted in
+bulk instead of one value at a time by the field parser.
+
+This requires NumPy, which is only imported when these functions are
+called.
+"""
+import os
+import mmap
+
+# Julian day number of 1970-01-01.
+JULIAN_EPOCH = 2440588
+
+# VFP versions where B is a double instead of a memo.
+VFP_VERSIONS = (0x30, 0x31, 0x32)
+
+# Binary field types and their NumPy types. (B is handled separately.)
+BINARY_FORMATS = {
+    'I': ('<i4', 4),
+    '+': ('<i4', 4),
+    'O': ('<f8', 8),
+    'Y': ('<i8', 8),
+    'T': ('<u4', 8),
+    '@': ('<u4', 8),
+}
+
+
+def _get_raw_format(table, field):
+    """Return the NumPy type used to view the field data.
+
+    Returns None if the column must be parsed one value at a time.
+    """
+    field_type = field.type
+    if field_type == 'B' and table.header.dbversion in VFP_VERSIONS:
+        field_type = 'O'
+
+    if field_type in BINARY_FORMATS:
+        format, length = BINARY_FORMATS[field_type]
+        if field.length != length:
+            return None
+        elif field_type in 'T@':
+            return (format, (2,))
+        else:
+            return format
+    elif field_type == 'D' and field.length == 8:
+        return ('u1', (8,))
+    elif field_type in 'CVNFL':
+        return 'S{}'.format(field.length)
+    else:
+        return None
+
+
+def _make_raw_dtype(np, table, slices, parser):
+    """Return a dtype for viewing record data.
+
+    Every field is available as raw bytes ('v0', 'v1' ...). Fields that
+    can be converted in bulk are also viewed with a suitable NumPy type
+    ('f0', 'f1' ...).
+    """
+    names = ['deleted']
+    formats = ['S1']
+    offsets = [0]
+
+    for i, (field, start, end) in enumerate(slices):
+        names.append('v{}'.format(i))
+        formats.append('V{}'.format(field.length))
+        offsets.append(start)
+
+        if table.raw or not parser.uses_default_parser(field.type):
+            continue
+
+        format = _get_raw_format(table, field)
+        if format is not None:
+            names.append('f{}'.format(i))
+            formats.append(format)
+            offsets.append(start)
+
+    return np.dtype({'names': names,
+                     'formats': formats,
+                     'offsets': offsets,
+                     'itemsize': table.header.recordlen})
+
+
+def _parse_values(np, parse, field, column):
+    """Parse a column of raw bytes one value at a time."""
+    values = np.empty(len(column), dtype=object)
+    for i, data in enumerate(column):
+        values[i] = parse(field, data.tobytes())
+    return values
+
+
+def _is_ascii_compatible(encoding):
+    ascii = bytes(bytearray(range(128)))
+    try:
+        return ascii.decode(encoding) == ascii.decode('ascii')
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def _convert_text(np, table, field, column):
+    column = np.char.rstrip(column, b'\0 ')
+    dtype = 'U{}'.format(max(1, field.length))
+
+    if _is_ascii_compatible(table.encoding):
+        data = np.ascontiguousarray(column).view(np.uint8)
+        if (data < 128).all():
+            # NumPy can do this without calling the codec.
+            return column.astype(dtype)
+
+    text = np.char.decode(column, table.encoding, table.char_decode_errors)
+    return text.astype(dtype)
+
+
+def _convert_number(np, field, column):
+    column = np.char.strip(column, b' *\0')
+    blank = column == b''
+    if field.type == 'N':
+        # Account for , in numeric fields
+        column = np.char.replace(column, b',', b'.')
+    column[blank] = b'nan'
+    return column.astype(np.float64)
+
+
+def _convert_date(np, column):
+    digits = column.astype(np.int32) - ord('0')
+    blank = ((digits == 0) | (column == ord(' ')) | (column == 0)).all(axis=1)
+
+    if not ((0 <= digits) & (digits <= 9)).all(axis=1)[~blank].all():
+        raise ValueError('invalid date')
+
+    weights = [1000, 100, 10, 1]
+    year = digits[:, 0:4].dot(weights)
+    month = digits[:, 4:6].dot(weights[2:])
+    day = digits[:, 6:8].dot(weights[2:])
+    year[blank] = 1970
+    month[blank] = 1
+    day[blank] = 1
+
+    if ((year < 1) | (month < 1) | (month > 12) | (day < 1)).any():
+        raise ValueError('invalid date')
+
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    dates = months.astype('datetime64[D]') + (day - 1)
+    if (dates.astype('datetime64[M]') != months).any():
+        # Day is past the end of the month.
+        raise ValueError('invalid date')
+
+    dates[blank] = np.datetime64('NaT')
+    return dates
+
+
+def _convert_logical(np, column):
+    true = np.isin(column, [b'T', b't', b'Y', b'y'])
+    false = np.isin(column, [b'F', b'f', b'N', b'n'])
+    null = np.isin(column, [b'?', b' ', b''])
+    if not (true | false | null).all():
+        raise ValueError('illegal value for logical field')
+
+    values = np.full(len(column), None, dtype=object)
+    values[true] = True
+    values[false] = False
+    return values
+
+
+def _convert_time(np, column):
+    day = column[:, 0].astype(np.int64)
+    msec = column[:, 1].astype(np.int64)
+    blank = (day == 0) | ((day == 0x20202020) & (msec == 0x20202020))
+
+    msec += (day - JULIAN_EPOCH) * 86400000
+    times = msec.astype('datetime64[ms]')
+    times[blank] = np.datetime64('NaT')
+    return times
+
+
+def _convert_column(np, table, field, column):
+    field_type = field.type
+    if field_type == 'B':
+        field_type = 'O'
+
+    if field_type in 'CV':
+        return _convert_text(np, table, field, column)
+    elif field_type in 'NF':
+        return _convert_number(np, field, column)
+    elif field_type == 'D':
+        return _convert_date(np, column)
+    elif field_type == 'L':
+        return _convert_logical(np, column)
+    elif field_type in 'T@':
+        return _convert_time(np, column)
+    elif field_type == 'Y':
+        return column / 10000.0
+    else:
+        return column.copy()
+
+
+def _convert_columns(np, table, parse, slices, records):
+    """Convert records from _iter_raw_records() to a list of columns."""
+    columns = []
+    for i, (field, _, _) in enumerate(slices):
+        name = 'f{}'.format(i)
+        column = None
+        if name in records.dtype.names:
+            try:
+                column = _convert_column(np, table, field, records[name])
+            except ValueError:
+                # Let the field parser deal with the bad values.
+                pass
+
+        if column is None:
+            raw_column = records['v{}'.format(i)]
+            column = _parse_values(np, parse, field, raw_column)
+        columns.append(column)
+
+    return columns
+
+
+def _make_array(np, slices, columns, length):
+    dtype = [(field.name, column.dtype, column.shape[1:])
+             for (field, _, _), column in zip(slices, columns)]
+    array = np.empty(length, dtype=dtype)
+    for (field, _, _), column in zip(slices, columns):
+        array[field.name] = column
+    return array
+
+
+def _get_parse(table, memofile):
+    if table.raw:
+        def parse(field, data):
+            return data
+        return parse
+    else:
+        return table.parserclass(table, memofile).parse
+
+
+def _iter_raw_records(np, table, slices, batch_size=None):
+    """Yield (records, parse) for batches of up to batch_size records.
+
+    records is a structured array (see _make_raw_dtype()) with the
+    records that are not deleted, copied out of a memory map of the
+    file. parse is the function to use for parsing values one at a
+    time. The memo file is open until the next batch is requested.
+    """
+    header = table.header
+
+    memo_slices = slices + table._get_where_slices()
+    with open(table.filename, 'rb') as infile, \
+            table._open_memofile(memo_slices, allow_lazy=False) as memofile:
+        size = os.fstat(infile.fileno()).st_size
+        count = max(0, size - header.headerlen) // header.recordlen
+        if count == 0:
+            return
+
+        parser = table.parserclass(table, memofile)
+        parse = _get_parse(table, memofile)
+        dtype = _make_raw_dtype(np, table, slices, parser)
+        match = table._make_match(memofile)
+        batch_size = batch_size or count
+
+        mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for start in range(0, count, batch_size):
+                raw = np.frombuffer(
+                    mm, dtype=dtype,
+                    count=min(batch_size, count - start),
+                    offset=header.headerlen + start * header.recordlen)
+
+                end = np.flatnonzero(raw['deleted'] == b'\x1a')
+                if len(end):
+                    raw = raw[:end[0]]
+
+                keep = raw['deleted'] == b' '
+                if match is not None:
+                    _match_records(match, mm, header, start, keep)
+
+                records = raw[keep]
+                # The memory map can't be closed while raw refers to it.
+                del raw
+                yield records, parse
+
+                if len(end):
+                    break
+        finally:
+            try:
+                mm.close()
+            except BufferError:
+                # An exception left a reference to the memory map.
+                # It will be closed when that is garbage collected.
+                pass
+
+
+def _match_records(match, mm, header, start, keep):
+    """Clear keep for records that don't match the where option."""
+    recordlen = header.recordlen
+    offset = header.headerlen + start * recordlen
+    for i in keep.nonzero()[0]:
+        pos = offset + i * recordlen
+        keep[i] = match(mm[pos:pos + recordlen])
+
+
+def _empty_records(np, table, slices):
+    """Return (records, parse) with no records."""
+    parser = table.parserclass(table)
+    dtype = _make_raw_dtype(np, table, slices, parser)
+    return np.zeros(0, dtype=dtype), _get_parse(table, None)
+
+
+def iter_numpy(table, batch_size=None, columns=None):
+    """Yield records as NumPy structured arrays of up to batch_size records.
+
+    Deleted records are left out, so arrays may be shorter than
+    batch_size. If batch_size is None all records are returned in
+    one array. columns overrides table.columns.
+    """
+    import numpy as np
+
+    slices = table._get_field_slices(columns)
+    for records, parse in _iter_raw_records(np, table, slices, batch_size):
+        columns = _convert_columns(np, table, parse, slices, records)
+        yield _make_array(np, slices, columns, len(records))
+
+
+def to_numpy(table, columns=None):
+    """Return all records as a NumPy structured array."""
+    import numpy as np
+
+    for array in iter_numpy(table, columns=columns):
+        return array
+
+    slices = table._get_field_slices(columns)
+    records, parse = _empty_records(np, table, slices)
+    columns = _convert_columns(np, table, parse, slices, records)
+    return _make_array(np, slices, columns, 0)
@@ -0,0 +1,125 @@
+"""
+Parse records in several worker processes.
+
+The record area of the file is split into ranges of records. Each
+worker is handed the file name, the table options and a range. It
+opens the table and memo file itself and returns the parsed records,
+so record data is never sent between processes.
+
+Everything in the table options (parserclass, recfactory and the
+where conditions) must be picklable. This means lambdas and locally
+defined classes or functions can't be used.
+
+Lazy memos and lazy records need the table that made them, which is
+in the worker process, and statistics would be collected in the
+workers, so the lazy_memos, lazy_records, stats and stats_callback
+options can't be used.
+"""
+import os
+import multiprocessing
+
+from .dbf import DBF
+
+# Number of records for each worker task.
+BATCH_SIZE = 10000
+
+
+def _check_options(table):
+    """Raise ValueError if the table uses options that don't work with
+    worker processes."""
+    names = []
+    if table.lazy_memos:
+        names.append('lazy_memos')
+    if table.lazy_records:
+        names.append('lazy_records')
+    if table.stats is not None:
+        names.append('stats')
+    if names:
+        raise ValueError('Options not supported with worker processes:'
+                         ' {}'.format(', '.join(names)))
+
+
+def _get_options(table):
+    """Return keyword arguments for opening the same table again."""
+    return dict(encoding=table.encoding,
+                # The file name is already resolved.
+                ignorecase=False,
+                lowernames=table.lowernames,
+                parserclass=table.parserclass,
+                recfactory=table.recfactory,
+                raw=table.raw,
+                ignore_missing_memofile=table.ignore_missing_memofile,
+                char_decode_errors=table.char_decode_errors,
+                columns=table.columns,
+                where=table.where,
+                memo_cache_size=table.memo_cache_size,
+                numeric_mode=table.numeric_mode,
+                value_cache_types=table.value_cache_types,
+                value_cache_size=table.value_cache_size)
+
+
+def _read_range(task):
+    filename, options, record_type, start, stop = task
+    table = DBF(filename, **options)
+    return list(table._iter_records(record_type, start, stop))
+
+
+def _count_record_data(table):
+    """Return the number of complete records in the file."""
+    header = table.header
+    size = os.path.getsize(table.filename)
+    return max(0, size - header.headerlen) // header.recordlen
+
+
+def iter_records(table, workers=None, ordered=True, batch_size=BATCH_SIZE,
+                 deleted=False):
+    """Yield records from table parsed in worker processes.
+
+    workers is the number of processes (default is the number of
+    CPUs). If ordered is False records are returned in whatever order
+    the ranges are finished. If deleted is True deleted records are
+    returned instead.
+
+    Raises ValueError if the table uses lazy_memos, lazy_records, stats
+    or stats_callback.
+    """
+    if batch_size < 1:
+        raise ValueError('batch_size must be at least 1')
+
+    _check_options(table)
+
+    record_type = b'*' if deleted else b' '
+    options = _get_options(table)
+    count = _count_record_data(table)
+    tasks = [(table.filename, options, record_type,
+              start, min(start + batch_size, count))
+             for start in range(0, count, batch_size)]
+    if not tasks:
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        if ordered:
+            results = pool.imap(_read_range, tasks)
+        else:
+            results = pool.imap_unordered(_read_range, tasks)
+
+        for records in results:
+            for record in records:
+                yield record
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def read(filename, workers=None, ordered=True, batch_size=BATCH_SIZE,
+         **kwargs):
+    """Yield records from a DBF file parsed in worker processes.
+
+    Keyword arguments are passed on to DBF(). See iter_records() for
+    the other arguments.
+    """
+    table = DBF(filename, **kwargs)
+    return iter_records(table, workers=workers, ordered=ordered,
+                        batch_size=batch_size)
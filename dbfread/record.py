@@ -0,0 +1,77 @@
+"""
+Records that parse their fields when they are used.
+"""
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+
+# Value in LazyRecord._values for fields that are not parsed yet.
+_NOT_PARSED = object()
+
+
+class RecordSchema(object):
+    """Fields and parse functions shared by all the records of a table.
+
+    slices is a list of (field, start, end) where start and end are
+    the positions of the field data in the record. parse_functions has
+    a function for each field, called as func(field, data).
+    """
+    def __init__(self, slices, parse_functions):
+        self.slices = slices
+        self.parse_functions = parse_functions
+        self.names = [field.name for field, _, _ in slices]
+        self.index = dict((name, i) for i, name in enumerate(self.names))
+
+
+class LazyRecord(Mapping):
+    """Record that holds the record data and parses a field the first
+    time it's used.
+
+    Fields can be looked up as keys (record['NAME']) or attributes
+    (record.NAME).
+    """
+    __slots__ = ['_schema', '_data', '_values']
+
+    def __init__(self, schema, data):
+        self._schema = schema
+        self._data = data
+        # Created when the first field is parsed.
+        self._values = None
+
+    def __getitem__(self, name):
+        schema = self._schema
+        i = schema.index[name]
+
+        values = self._values
+        if values is None:
+            values = self._values = [_NOT_PARSED] * len(schema.names)
+
+        value = values[i]
+        if value is _NOT_PARSED:
+            field, start, end = schema.slices[i]
+            parse = schema.parse_functions[i]
+            value = values[i] = parse(field, self._data[start:end])
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            # Don't look up slots that are not set yet.
+            raise AttributeError(name)
+
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __iter__(self):
+        return iter(self._schema.names)
+
+    def __len__(self):
+        return len(self._schema.names)
+
+    def __repr__(self):
+        items = ', '.join('{!r}: {!r}'.format(name, self[name])
+                          for name in self)
+        return 'LazyRecord({{{}}})'.format(items)
@@ -0,0 +1,261 @@
+"""
+Statistics about where time goes when records are read.
+
+Enabled with DBF(..., stats=True) or DBF(..., stats_callback=func).
+When enabled the table file, memo file, parse functions and record
+factory are wrapped in functions that count and time the calls. When
+disabled nothing is wrapped, so there is no cost.
+
+Records, file reads and time are counted for each pass over the
+records (iterating, load(), iter_all(), iter_batches() and counting
+records with the where option). Reads through the memory map
+(get_record(), lookup(), find() and counting deletion flags for len())
+are not counted, but fields parsed by get_record() are.
+"""
+from timeit import default_timer
+
+from .memo import LazyMemo
+
+
+class TimeStats(object):
+    """Number of calls and the time spent in them."""
+    __slots__ = ['count', 'seconds']
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def as_dict(self):
+        return {'count': self.count, 'seconds': self.seconds}
+
+    def __repr__(self):
+        return '<TimeStats count={} seconds={:.6f}>'.format(self.count,
+                                                            self.seconds)
+
+
+class IOStats(object):
+    """Read and seek calls on a file."""
+    __slots__ = ['reads', 'seeks', 'bytes_read']
+
+    def __init__(self):
+        self.reads = 0
+        self.seeks = 0
+        self.bytes_read = 0
+
+    def as_dict(self):
+        return {'reads': self.reads,
+                'seeks': self.seeks,
+                'bytes_read': self.bytes_read}
+
+    def __repr__(self):
+        return '<IOStats reads={} seeks={} bytes_read={}>'.format(
+            self.reads, self.seeks, self.bytes_read)
+
+
+class StatsFile(object):
+    """Counts read() and seek() calls on the table file.
+
+    The pass over the records is timed from when the file is opened
+    until it's closed.
+    """
+    def __init__(self, infile, stats):
+        self._file = infile
+        self._stats = stats
+        self._io = stats.table_io
+        self._start = default_timer()
+
+    def read(self, size=-1):
+        data = self._file.read(size)
+        self._io.reads += 1
+        self._io.bytes_read += len(data)
+        return data
+
+    def seek(self, offset, whence=0):
+        self._io.seeks += 1
+        return self._file.seek(offset, whence)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            self._stats._end_pass(default_timer() - self._start)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+        return False
+
+
+class StatsMemoFile(object):
+    """Counts and times memo lookups.
+
+    Memo files are memory mapped, so memos read from the file are
+    counted instead of read() calls. Memos found in the memo cache are
+    counted as cache hits instead. Memos that are read later (lazy
+    memos) are counted when they are looked up but not in bytes_read.
+    """
+    def __init__(self, memofile, stats):
+        self._memofile = memofile
+        self._stats = stats
+        self._io = stats.memo_io
+        self._time = stats.memo_time
+
+    def __getitem__(self, index):
+        cache = self._memofile.cache
+        if cache is not None:
+            hits = cache.hits
+            misses = cache.misses
+
+        start = default_timer()
+        memo = self._memofile[index]
+        self._time.seconds += default_timer() - start
+        self._time.count += 1
+
+        if cache is not None:
+            self._stats.memo_cache_hits += cache.hits - hits
+            self._stats.memo_cache_misses += cache.misses - misses
+            if cache.hits != hits:
+                return memo
+
+        if memo is not None and not isinstance(memo, LazyMemo):
+            self._io.reads += 1
+            self._io.bytes_read += len(memo)
+        return memo
+
+    def __getattr__(self, name):
+        return getattr(self._memofile, name)
+
+    def __enter__(self):
+        self._memofile.__enter__()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return self._memofile.__exit__(type, value, traceback)
+
+
+class Stats(object):
+    """Statistics for a table.
+
+    callback is called with the Stats object at the end of each pass
+    over the records.
+    """
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        """Set all counters to 0."""
+        #: Parse calls and time by field name.
+        self.fields = {}
+        #: Parse calls and time by field type.
+        self.types = {}
+        #: Calls and time spent in the record factory.
+        self.recfactory = TimeStats()
+        #: Memo lookups and time.
+        self.memo_time = TimeStats()
+        self.table_io = IOStats()
+        #: Memos read from the memo file (not from the memo cache).
+        self.memo_io = IOStats()
+        #: Memo lookups found and not found in the memo cache.
+        self.memo_cache_hits = 0
+        self.memo_cache_misses = 0
+        #: Number of records returned.
+        self.records = 0
+        #: Number of passes over the records.
+        self.passes = 0
+        #: Total time of all passes (including time spent by the caller
+        #: between records).
+        self.seconds = 0.0
+
+    @property
+    def records_per_second(self):
+        if self.seconds:
+            return self.records / self.seconds
+        else:
+            return 0.0
+
+    def _end_pass(self, seconds):
+        self.passes += 1
+        self.seconds += seconds
+        if self.callback is not None:
+            self.callback(self)
+
+    def open_file(self, infile):
+        """Wrap the table file."""
+        return StatsFile(infile, self)
+
+    def wrap_memofile(self, memofile):
+        return StatsMemoFile(memofile, self)
+
+    def _get_field_stats(self, field):
+        field_stats = self.fields.get(field.name)
+        if field_stats is None:
+            field_stats = self.fields[field.name] = TimeStats()
+            if field.type not in self.types:
+                self.types[field.type] = TimeStats()
+        return field_stats, self.types[field.type]
+
+    def wrap_parse(self, parse):
+        """Return a parse function that is counted and timed."""
+        get_field_stats = self._get_field_stats
+
+        def timed_parse(field, data):
+            start = default_timer()
+            value = parse(field, data)
+            seconds = default_timer() - start
+            for stats in get_field_stats(field):
+                stats.count += 1
+                stats.seconds += seconds
+            return value
+
+        return timed_parse
+
+    def wrap_recfactory(self, recfactory):
+        stats = self.recfactory
+
+        def timed_recfactory(items):
+            start = default_timer()
+            record = recfactory(items)
+            stats.seconds += default_timer() - start
+            stats.count += 1
+            return record
+
+        return timed_recfactory
+
+    def wrap_decode(self, decode, batch=False):
+        """Return a decode function that counts records.
+
+        If batch is True decode takes a list of records.
+        """
+        def counted_decode(data):
+            self.records += len(data) if batch else 1
+            return decode(data)
+
+        return counted_decode
+
+    def as_dict(self):
+        """Return the statistics as a dictionary of plain values."""
+        return {
+            'records': self.records,
+            'passes': self.passes,
+            'seconds': self.seconds,
+            'records_per_second': self.records_per_second,
+            'fields': dict((name, stats.as_dict())
+                           for name, stats in self.fields.items()),
+            'types': dict((name, stats.as_dict())
+                          for name, stats in self.types.items()),
+            'recfactory': self.recfactory.as_dict(),
+            'table_io': self.table_io.as_dict(),
+            'memo_io': self.memo_io.as_dict(),
+            'memo_time': self.memo_time.as_dict(),
+            'memo_cache_hits': self.memo_cache_hits,
+            'memo_cache_misses': self.memo_cache_misses,
+        }
+
+    def __repr__(self):
+        return '<Stats {} records in {:.3f} seconds ({} passes)>'.format(
+            self.records, self.seconds, self.passes)
@@ -0,0 +1,123 @@
+"""
+Read records that have been appended to a DBF file.
+
+    >>> tail = TailReader('sales.dbf')
+    >>> tail.read()           # All records.
+    >>> tail.read()           # Records appended since the last call.
+
+Only the header and the new records are read. The number of records
+is the smaller of the number in the header and the number of complete
+records in the file, so records that are still being written are
+picked up by the next call.
+
+The position can be saved with the checkpoint attribute and given to
+a new TailReader to continue later. To notice if the file has been
+replaced or rewritten the checkpoint also holds a checksum of the
+field definitions and of the last record that was read. If the file
+has been truncated or either checksum doesn't match, the next read()
+starts over from the first record and sets restarted to True. Changes
+to records before the last one are not detected.
+"""
+import os
+import zlib
+
+from .dbf import DBF, DBFHeader
+
+CHECKPOINT_VERSION = 'dbfread-tail-1'
+
+
+def _crc(data):
+    return zlib.crc32(data) & 0xffffffff
+
+
+def _parse_checkpoint(checkpoint):
+    """Return (position, layout checksum, record checksum)."""
+    try:
+        version, position, layout_crc, record_crc = checkpoint.split(':')
+        if version != CHECKPOINT_VERSION:
+            raise ValueError
+        return int(position), int(layout_crc, 16), int(record_crc, 16)
+    except ValueError:
+        raise ValueError('Invalid checkpoint: {!r}'.format(checkpoint))
+
+
+class TailReader(object):
+    """Read records appended to a DBF file since the last read.
+
+    checkpoint is a value of the checkpoint attribute from an earlier
+    TailReader. Keyword arguments are passed on to DBF().
+    """
+    def __init__(self, filename, checkpoint=None, **kwargs):
+        self.filename = filename
+        self.options = kwargs
+
+        #: Number of records read so far (including deleted records).
+        self.position = 0
+
+        #: True if the last read() started over from the beginning.
+        self.restarted = False
+
+        self._layout_crc = 0
+        self._record_crc = 0
+        if checkpoint is not None:
+            (self.position, self._layout_crc,
+             self._record_crc) = _parse_checkpoint(checkpoint)
+
+    @property
+    def checkpoint(self):
+        """A string that can be used to continue from this position."""
+        return '{}:{}:{:08x}:{:08x}'.format(CHECKPOINT_VERSION,
+                                            self.position,
+                                            self._layout_crc,
+                                            self._record_crc)
+
+    def _read_record_data(self, infile, table, index):
+        infile.seek(table.header.headerlen + index * table.header.recordlen)
+        return infile.read(table.header.recordlen)
+
+    def _is_same_file(self, infile, table, layout_crc, count):
+        if self.position == 0:
+            return True
+        elif layout_crc != self._layout_crc or count < self.position:
+            return False
+        else:
+            data = self._read_record_data(infile, table, self.position - 1)
+            return _crc(data) == self._record_crc
+
+    def read(self):
+        """Return a list of the records appended since the last read.
+
+        Deleted records are skipped.
+        """
+        table = DBF(self.filename, **self.options)
+        header = table.header
+
+        # DBF() finds the file even if the case of the name is wrong.
+        with open(table.filename, 'rb') as infile:
+            # The field headers.
+            infile.seek(DBFHeader.size)
+            layout_crc = _crc(infile.read(header.headerlen - DBFHeader.size))
+
+            size = os.fstat(infile.fileno()).st_size
+            complete = max(0, size - header.headerlen) // header.recordlen
+            count = min(header.numrecords, complete)
+
+            self.restarted = not self._is_same_file(infile, table,
+                                                    layout_crc, count)
+            if self.restarted:
+                self.position = 0
+
+            start = self.position
+            records = list(table._iter_records(b' ', start, count))
+
+            if count > start:
+                data = self._read_record_data(infile, table, count - 1)
+                self._record_crc = _crc(data)
+            self.position = max(start, count)
+            self._layout_crc = layout_crc
+
+        return records
+
+    def __repr__(self):
+        return '<TailReader {!r} at record {}>'.format(self.filename,
+                                                       self.position)
@@ -0,0 +1,71 @@
+"""
+Caches of parsed values for fields with few distinct values.
+
+Date and logical columns often have only a few thousand distinct
+values in millions of records. The cache maps raw field data to the
+parsed value so each distinct value is only parsed once.
+"""
+
+# Only fields up to this length are cached.
+MAX_LENGTH = 32
+
+
+class ValueCache(object):
+    """Parsed values for a field keyed by the raw field data.
+
+    Values are added until there are maxsize of them. After that only
+    the values already in the cache are used.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def __len__(self):
+        return len(self._values)
+
+    @property
+    def hit_rate(self):
+        """The fraction of lookups that were found in the cache."""
+        total = self.hits + self.misses
+        if total:
+            return float(self.hits) / total
+        else:
+            return 0.0
+
+    def wrap(self, parse):
+        """Return a version of parse(field, data) that uses the cache."""
+        values = self._values
+        maxsize = self.maxsize
+
+        def parse_cached(field, data):
+            try:
+                value = values[data]
+            except KeyError:
+                self.misses += 1
+                value = parse(field, data)
+                if len(values) < maxsize:
+                    values[data] = value
+                return value
+            else:
+                self.hits += 1
+                return value
+
+        return parse_cached
+
+    def __repr__(self):
+        return '<ValueCache {}/{} values, {} hits, {} misses>'.format(
+            len(self._values), self.maxsize, self.hits, self.misses)
+
+
+def can_cache(field, parser, field_types):
+    """Return True if values for this field can be cached."""
+    if field.type not in field_types or field.type in 'MGPB':
+        # Memos are looked up in the memo file.
+        return False
+    elif field.length > MAX_LENGTH:
+        return False
+    else:
+        # A custom parser could return mutable values or use state.
+        return parser.uses_default_parser(field.type)
@@ -0,0 +1,182 @@
+"""
+Record filters for the where option.
+
+where is a dictionary of field names and conditions. A condition can
+be:
+
+    value          field value must be equal to value
+    (low, high)    field value must be in this range (inclusive).
+                   Either end can be None.
+    set([a, b])    field value must be in the set
+    function       function(value) must return True
+
+Where possible conditions are tested on the raw field data, so
+records that don't match are never parsed.
+"""
+import struct
+import datetime
+
+from .memo import LazyMemo
+
+text_type = type(u'')
+
+_int_struct = struct.Struct('<i')
+
+
+def _date_key(date):
+    return '{:04d}{:02d}{:02d}'.format(date.year, date.month,
+                                       date.day).encode('ascii')
+
+
+def _in_range(value, low, high):
+    if value is None:
+        return False
+    elif low is not None and value < low:
+        return False
+    elif high is not None and value > high:
+        return False
+    else:
+        return True
+
+
+def _make_value_test(condition):
+    """Return a function that tests a parsed value."""
+    if callable(condition):
+        return condition
+    elif isinstance(condition, tuple):
+        low, high = condition
+        return lambda value: _in_range(value, low, high)
+    elif isinstance(condition, (set, frozenset)):
+        return lambda value: value in condition
+    else:
+        return lambda value: value == condition
+
+
+def _make_text_test(table, condition, start, end):
+    """Compare encoded text with the field data."""
+    if not isinstance(condition, (text_type, set, frozenset)):
+        return None
+    elif table.char_decode_errors != 'strict':
+        # Different data could decode to the same text.
+        return None
+
+    if isinstance(condition, text_type):
+        condition = [condition]
+
+    keys = set()
+    for text in condition:
+        if not isinstance(text, text_type):
+            return None
+        try:
+            keys.add(text.encode(table.encoding))
+        except UnicodeEncodeError:
+            # Can't be in the file.
+            pass
+
+    return lambda data: data[start:end].rstrip(b'\0 ') in keys
+
+
+def _make_date_test(condition, start, end):
+    """Compare YYYYMMDD data."""
+    def is_date(value):
+        return isinstance(value, datetime.date)
+
+    if isinstance(condition, tuple):
+        low, high = condition
+        if not all(is_date(d) or d is None for d in condition):
+            return None
+        low = low and _date_key(low)
+        high = high and _date_key(high)
+
+        def test(data):
+            data = data[start:end]
+            if not data.isdigit() or data == b'00000000':
+                # Blank or invalid date.
+                return False
+            return _in_range(data, low, high)
+        return test
+
+    elif is_date(condition):
+        key = _date_key(condition)
+        return lambda data: data[start:end] == key
+
+    else:
+        return None
+
+
+def _make_int_test(condition, start):
+    """Unpack the integer without going through the parser."""
+    if callable(condition):
+        return None
+
+    unpack_from = _int_struct.unpack_from
+    test = _make_value_test(condition)
+    return lambda data: test(unpack_from(data, start)[0])
+
+
+def _make_raw_test(table, field, condition, start, end):
+    """Return a test that works on the raw data, or None."""
+    if field.type in 'CV':
+        return _make_text_test(table, condition, start, end)
+    elif field.type == 'D' and field.length == 8:
+        return _make_date_test(condition, start, end)
+    elif field.type in 'I+' and field.length == 4:
+        return _make_int_test(condition, start)
+    else:
+        return None
+
+
+def _make_parse_test(parser, field, condition, start, end):
+    value_test = _make_value_test(condition)
+
+    if parser is None:
+        def test(data):
+            return value_test(data[start:end])
+    elif field.type in 'MGPB':
+        parse = parser.parse
+
+        def test(data):
+            value = parse(field, data[start:end])
+            if isinstance(value, LazyMemo):
+                value = value.value
+            return value_test(value)
+    else:
+        parse = parser.parse
+
+        def test(data):
+            return value_test(parse(field, data[start:end]))
+
+    return test
+
+
+def compile_where(table, parser, where):
+    """Return a function that takes record data and returns True if
+    the record matches all the conditions in where.
+
+    parser is the FieldParser (or None in raw mode) used for the
+    conditions that can't be tested on the raw data.
+    """
+    slices = dict((field.name, (field, start, end)) for field, start, end
+                  in table._get_field_slices(table.field_names))
+
+    tests = []
+    for name, condition in where.items():
+        if name not in slices:
+            raise ValueError('Unknown field: {!r}'.format(name))
+        field, start, end = slices[name]
+
+        test = None
+        if parser is not None and parser.uses_default_parser(field.type):
+            test = _make_raw_test(table, field, condition, start, end)
+
+        if test is None:
+            test = _make_parse_test(parser, field, condition, start, end)
+        tests.append(test)
+
+    def match(data):
+        for test in tests:
+            if not test(data):
+                return False
+        return True
+
+    return match
@@ -0,0 +1,21 @@
+"""
+Fixtures shared by the tests.
+"""
+import shutil
+from pytest import fixture
+
+
+@fixture
+def copy_memotest(tmpdir):
+    """Return a function that copies the memotest table to tmpdir.
+
+    copy_memotest(name) copies the table and its memo file to name.dbf
+    and name.FPT and returns the file name of the table.
+    """
+    def copy(name='memotest'):
+        filename = str(tmpdir.join(name + '.dbf'))
+        shutil.copy('tests/cases/memotest.dbf', filename)
+        memo_filename = str(tmpdir.join(name + '.FPT'))
+        shutil.copy('tests/cases/memotest.FPT', memo_filename)
+        return filename
+    return copy
@@ -0,0 +1,93 @@
+import time
+from pytest import importorskip, raises
+from dbfread import DBF
+from test_read_and_length import records, deleted_records
+
+aio = importorskip('dbfread.aio')
+asyncio = importorskip('asyncio')
+
+
+def collect(loop, aiterable):
+    """Run async for over aiterable and return a list of the items."""
+    iterator = aiterable.__aiter__()
+    items = []
+    while True:
+        try:
+            items.append(loop.run_until_complete(iterator.__anext__()))
+        except StopAsyncIteration:
+            return items
+
+
+def run(func):
+    loop = asyncio.new_event_loop()
+    try:
+        return func(loop)
+    finally:
+        loop.close()
+
+
+def test_records():
+    def test(loop):
+        table = aio.AsyncDBF('tests/cases/memotest.dbf', batch_size=1,
+                             loop=loop)
+        assert collect(loop, table) == records
+    run(test)
+
+
+def test_batches():
+    def test(loop):
+        table = aio.AsyncDBF(DBF('tests/cases/memotest.dbf'), loop=loop)
+        assert collect(loop, table.iter_batches(1)) == [[r] for r in records]
+        assert collect(loop, table.iter_batches(deleted=True)) == [
+            deleted_records]
+        assert loop.run_until_complete(table.count()) == 2
+        assert loop.run_until_complete(table.count(deleted=True)) == 1
+        loop.run_until_complete(table.load())
+        assert table.table.records == records
+    run(test)
+
+
+def test_cancel():
+    def test(loop):
+        table = aio.AsyncDBF('tests/cases/memotest.dbf', loop=loop)
+        iterator = table.iter_batches(1)
+        future = iterator.__anext__()
+        future.cancel()
+        # The batch that was being read is not lost.
+        assert collect(loop, iterator) == [[r] for r in records]
+    run(test)
+
+
+def test_cancel_record():
+    def slow_batches():
+        for record in records:
+            time.sleep(0.1)
+            yield [record]
+
+    def test(loop):
+        batches = aio.AsyncBatchIterator(slow_batches(), loop=loop)
+        iterator = aio.AsyncRecordIterator(batches)
+        # Cancelled while the first batch is being read.
+        with raises(asyncio.TimeoutError):
+            loop.run_until_complete(
+                asyncio.wait_for(iterator.__anext__(), 0.01))
+        assert collect(loop, iterator) == records
+    run(test)
+
+
+def test_aclose():
+    def test(loop):
+        table = aio.AsyncDBF('tests/cases/memotest.dbf', loop=loop)
+        iterator = table.__aiter__()
+        assert loop.run_until_complete(iterator.__anext__()) == records[0]
+        loop.run_until_complete(iterator.aclose())
+        assert collect(loop, iterator) == [records[1]]
+    run(test)
+
+
+def test_errors():
+    def test(loop):
+        table = aio.AsyncDBF('tests/cases/memotest.dbf', loop=loop)
+        with raises(ValueError):
+            table.iter_batches(layout='table')
+    run(test)
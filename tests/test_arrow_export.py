@@ -0,0 +1,193 @@
+import struct
+from decimal import Decimal
+from pytest import importorskip, raises
+from dbfread import DBF, FieldParser
+from dbfread.arrow_export import _convert_currency, to_arrow
+
+np = importorskip('numpy')
+pa = importorskip('pyarrow')
+
+
+def with_binary_memos(records):
+    """Return records with memos encoded as they are in the .fpt file."""
+    return [dict(record, MEMO=record['MEMO'].encode('ascii'))
+            for record in records]
+
+
+def test_to_arrow():
+    table = DBF('tests/cases/memotest.dbf')
+    arrow_table = table.to_arrow()
+
+    assert arrow_table.column_names == table.field_names
+    assert arrow_table.schema == table.arrow_schema()
+    assert arrow_table.schema.field('BIRTHDATE').type == pa.date32()
+    # Memos in .fpt files can be binary.
+    assert arrow_table.schema.field('MEMO').type == pa.large_binary()
+    assert arrow_table.to_pylist() == with_binary_memos(table)
+
+
+def test_iter_arrow_batches():
+    table = DBF('tests/cases/memotest.dbf')
+    batches = list(table.iter_arrow_batches(batch_size=2))
+
+    # The third record is deleted.
+    assert [batch.num_rows for batch in batches] == [2, 0]
+
+
+def test_raw():
+    table = DBF('tests/cases/memotest.dbf', raw=True)
+    assert table.to_arrow().to_pylist() == list(table)
+
+
+def test_currency():
+    values = np.array([1, -1, 123456789], dtype='<i8')
+    array = _convert_currency(pa, np, values)
+    assert array.to_pylist() == [Decimal('0.0001'),
+                                 Decimal('-0.0001'),
+                                 Decimal('12345.6789')]
+
+
+def test_dictionary():
+    table = DBF('tests/cases/memotest.dbf')
+    arrow_table = table.to_arrow(dictionary=['NAME', 'BIRTHDATE'])
+    for name in ['NAME', 'BIRTHDATE']:
+        assert pa.types.is_dictionary(arrow_table.schema.field(name).type)
+    assert arrow_table.to_pylist() == with_binary_memos(table)
+
+    array = arrow_table.column('NAME').chunk(0)
+    assert array.dictionary.to_pylist() == [u'Alice', u'Bob']
+    assert array.indices.to_pylist() == [0, 1]
+
+    assert table.to_arrow(columns=['NAME'], dictionary=['NAME']).num_rows == 2
+
+
+def test_dictionary_unknown_field():
+    table = DBF('tests/cases/memotest.dbf')
+    with raises(ValueError):
+        table.to_arrow(dictionary=['AGE'])
+
+
+def write_table(filename, fields, records):
+    """Write a table with a .fpt memo file.
+
+    fields is a list of (name, type, length, decimal count). records
+    is a list of lists of field data. Memos are (memo type, data)
+    and are stored in the memo file.
+    """
+    recordlen = 1 + sum(length for _, _, length, _ in fields)
+    header = struct.pack('<BBBBLHH20x', 0x30, 120, 1, 1, len(records),
+                         32 + 32 * len(fields) + 1 + 263, recordlen)
+    field_headers = b''.join(
+        struct.pack('<11scLBB14x', name, type, 0, length, decimal_count)
+        for name, type, length, decimal_count in fields)
+
+    # Memos are in 64 byte blocks after the 512 byte header.
+    memos = []
+    data = []
+    for record in records:
+        data.append(b' ')
+        for (_, type, length, _), value in zip(fields, record):
+            if type == b'M':
+                memo_type, memo = value
+                value = struct.pack('<L', 512 // 64 + len(memos))
+                memo_header = struct.pack('>LL', memo_type, len(memo))
+                memos.append(memo_header + memo.ljust(56, b'\0'))
+            data.append(value.rjust(length))
+
+    with open(filename, 'wb') as outfile:
+        outfile.write(header + field_headers + b'\r' + b'\0' * 263)
+        outfile.write(b''.join(data) + b'\x1a')
+
+    memo_header = struct.pack('>L2xH', 512 // 64 + len(memos), 64)
+    memo_header = memo_header.ljust(512, b'\0')
+    with open(filename[:-4] + '.fpt', 'wb') as outfile:
+        outfile.write(memo_header + b''.join(memos))
+
+
+def write_numbers(filename, values, length=20, decimal_count=0):
+    """Write a table with one N field."""
+    write_table(filename, [(b'NUM', b'N', length, decimal_count)],
+                [[value] for value in values])
+
+
+def test_integers(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'-12', b'7', b'', b'999999999999999999'],
+                  length=18)
+    table = DBF(filename)
+    arrow_table = table.to_arrow()
+    assert arrow_table.schema.field('NUM').type == pa.int64()
+    assert arrow_table.to_pylist() == list(table)
+
+
+def test_integer_too_large_for_int64(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'12345678901234567890', b'1', b''])
+    table = DBF(filename)
+    arrow_table = table.to_arrow()
+    assert arrow_table.schema.field('NUM').type == pa.decimal128(20, 0)
+    assert arrow_table.column('NUM').to_pylist() == [
+        Decimal('12345678901234567890'), Decimal(1), None]
+
+
+def test_integer_field_with_decimals(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'12', b'1.5'], length=10)
+    with raises(ValueError):
+        DBF(filename).to_arrow()
+
+    # Whole numbers written with decimals are fine.
+    write_numbers(filename, [b'12', b'1.0'], length=10)
+    assert DBF(filename).to_arrow().column('NUM').to_pylist() == [12, 1]
+
+
+def test_decimal_mode(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'1.25', b''], length=10, decimal_count=2)
+    table = DBF(filename, numeric_mode='decimal')
+    arrow_table = table.to_arrow()
+    assert arrow_table.schema.field('NUM').type == pa.decimal128(10, 2)
+    assert arrow_table.to_pylist() == list(table)
+
+
+def test_same_schema_for_all_batches(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'12', b'12345678901234567890', b''])
+    table = DBF(filename)
+    schema = table.arrow_schema()
+    batches = list(table.iter_arrow_batches(batch_size=1))
+    assert [batch.schema for batch in batches] == [schema] * 3
+
+    reader = pa.RecordBatchReader.from_batches(
+        schema, table.iter_arrow_batches(batch_size=1))
+    assert reader.read_all().num_rows == 3
+
+
+class LowerParser(FieldParser):
+    def parseN(self, field, data):
+        return data.strip().decode('ascii').lower()
+
+
+def test_custom_parser_types(tmpdir):
+    filename = str(tmpdir.join('numbers.dbf'))
+    write_numbers(filename, [b'A', b'B', b'C'])
+    table = DBF(filename, parserclass=LowerParser)
+    assert table.arrow_schema(batch_size=1).field('NUM').type == pa.string()
+    batches = list(table.iter_arrow_batches(batch_size=1))
+    assert [batch.column(0).type for batch in batches] == [pa.string()] * 3
+    assert to_arrow(table, batch_size=1).column('NUM').to_pylist() == [
+        u'a', u'b', u'c']
+
+
+def test_binary_memo(tmpdir):
+    filename = str(tmpdir.join('memos.dbf'))
+    write_table(filename, [(b'MEMO', b'M', 4, 0)],
+                [[(1, b'Text')], [(0, b'\xff\xfe')], [(2, b'\x00\x01')]])
+    table = DBF(filename)
+    assert [record['MEMO'] for record in table] == [
+        u'Text', b'\xff\xfe', b'\x00\x01']
+
+    arrow_table = table.to_arrow()
+    assert arrow_table.schema.field('MEMO').type == pa.large_binary()
+    assert arrow_table.column('MEMO').to_pylist() == [
+        b'Text', b'\xff\xfe', b'\x00\x01']
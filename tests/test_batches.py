@@ -0,0 +1,41 @@
+from pytest import raises
+from dbfread import DBF
+from test_read_and_length import records, deleted_records
+
+
+def test_rows():
+    table = DBF('tests/cases/memotest.dbf')
+    assert list(table.iter_batches(1)) == [[records[0]], [records[1]]]
+    assert list(table.iter_batches(10)) == [records]
+    assert list(table.iter_batches(10, deleted=True)) == [deleted_records]
+
+
+def test_columns():
+    table = DBF('tests/cases/memotest.dbf')
+    batches = list(table.iter_batches(10, layout='columns'))
+    assert batches == [{name: [r[name] for r in records]
+                        for name in table.field_names}]
+    assert list(batches[0]) == table.field_names
+
+
+def test_columns_small_batches():
+    table = DBF('tests/cases/memotest.dbf')
+    batches = list(table.iter_batches(1, layout='columns'))
+    assert [batch['NAME'] for batch in batches] == [[u'Alice'], [u'Bob']]
+
+    batches = list(table.iter_batches(layout='columns', deleted=True))
+    assert [batch['NAME'] for batch in batches] == [[u'Deleted Guy']]
+
+
+def test_columns_option():
+    table = DBF('tests/cases/memotest.dbf', columns=['NAME'],
+                where={'NAME': u'Bob'})
+    assert list(table.iter_batches(layout='columns')) == [{'NAME': [u'Bob']}]
+
+
+def test_invalid_arguments():
+    table = DBF('tests/cases/memotest.dbf')
+    with raises(ValueError):
+        table.iter_batches(0)
+    with raises(ValueError):
+        table.iter_batches(layout='table')
@@ -0,0 +1,26 @@
+from pytest import raises
+from dbfread import DBF
+from dbfread.memo import FakeMemoFile
+from test_read_and_length import records
+
+
+def test_columns():
+    table = DBF('tests/cases/memotest.dbf', columns=['BIRTHDATE', 'NAME'])
+    # Fields come in file order.
+    assert list(table) == [{'NAME': r['NAME'], 'BIRTHDATE': r['BIRTHDATE']}
+                           for r in records]
+    assert list(next(iter(table))) == ['NAME', 'BIRTHDATE']
+    assert table[1] == {'NAME': 'Bob', 'BIRTHDATE': records[1]['BIRTHDATE']}
+    table.close()
+
+
+def test_unknown_column():
+    with raises(ValueError):
+        DBF('tests/cases/memotest.dbf', columns=['NAME', 'AGE'])
+
+
+def test_memofile_not_needed():
+    # The memo file is missing but no memo fields are selected.
+    table = DBF('tests/cases/no_memofile.dbf', columns=['NAME'])
+    assert list(table) == [{'NAME': 'Alice'}, {'NAME': 'Bob'}]
+    assert isinstance(table._open_memofile(), FakeMemoFile)
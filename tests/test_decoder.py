@@ -0,0 +1,51 @@
+import collections
+from dbfread import DBF, FieldParser
+from dbfread.decoder import compile_decode
+from test_field_parser import MockField
+from test_read_and_length import records
+
+
+class ReverseParser(FieldParser):
+    def parseC(self, field, data):
+        return FieldParser.parseC(self, field, data)[::-1]
+
+
+class UpperParser(FieldParser):
+    def parse(self, field, data):
+        value = FieldParser.parse(self, field, data)
+        if field.type == 'C':
+            value = value.upper()
+        return value
+
+
+def test_compile_decode():
+    fields = [MockField('C', name='A'), MockField('C', name='B')]
+
+    def parse(field, data):
+        return field.name + data
+
+    def unpack(data):
+        return data.split()
+
+    for recfactory, record in [
+            (dict, {'A': 'A1', 'B': 'B2'}),
+            (list, [('A', 'A1'), ('B', 'B2')]),
+            (collections.OrderedDict, {'A': 'A1', 'B': 'B2'}),
+            (tuple, (('A', 'A1'), ('B', 'B2')))]:
+        decode = compile_decode(fields, [parse, parse], unpack, recfactory)
+        assert decode('1 2') == record
+
+    decode = compile_decode(fields, None, unpack, dict)
+    assert decode('1 2') == {'A': '1', 'B': '2'}
+
+    decode = compile_decode([], [], unpack, dict)
+    assert decode('') == {}
+
+
+def test_parse_overrides():
+    table = DBF('tests/cases/memotest.dbf', parserclass=ReverseParser)
+    assert [r['NAME'] for r in table] == [u'ecilA', u'boB']
+
+    table = DBF('tests/cases/memotest.dbf', parserclass=UpperParser)
+    assert [r['NAME'] for r in table] == [u'ALICE', u'BOB']
+    assert [r['MEMO'] for r in table] == [r['MEMO'] for r in records]
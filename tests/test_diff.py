@@ -0,0 +1,117 @@
+import struct
+from pytest import raises
+from dbfread import DBF
+from dbfread.diff import diff, Fingerprint, FingerprintHeader
+
+table = DBF('tests/cases/memotest.dbf')
+with open(table.filename, 'rb') as infile:
+    data = infile.read()
+header = data[:table.header.headerlen]
+alice, bob, deleted_guy = [
+    data[table.header.headerlen + i * table.header.recordlen:]
+    [:table.header.recordlen] for i in range(3)]
+carol = alice.replace(b'Alice', b'Carol')
+older_bob = bob.replace(b'1980', b'1970')
+deleted_bob = b'*' + bob[1:]
+undeleted_guy = b' ' + deleted_guy[1:]
+
+
+def write(copy_memotest, name, records):
+    filename = copy_memotest(name)
+    numrecords = struct.pack('<L', len(records))
+    with open(filename, 'wb') as outfile:
+        outfile.write(header[:4] + numrecords + header[8:])
+        outfile.write(b''.join(records) + b'\x1a')
+    return DBF(filename)
+
+
+def test_diff_by_record_number(copy_memotest):
+    old = write(copy_memotest, 'old', [alice, bob, deleted_guy])
+    new = write(copy_memotest, 'new', [alice, older_bob, undeleted_guy, carol])
+
+    changes = diff(old, new)
+    assert changes.inserted == [3]
+    assert changes.updated == [1]
+    assert changes.undeleted == [2]
+    assert changes.deleted == []
+    assert changes.records(new, changes.inserted)[0]['NAME'] == u'Carol'
+
+    changes = diff(new, old)
+    assert changes.deleted == [2, 3]
+    assert changes.updated == [1]
+
+    assert not diff(old, old)
+
+
+def test_diff_by_key(copy_memotest):
+    old = write(copy_memotest, 'old', [alice, bob, deleted_guy])
+    new = write(copy_memotest, 'new', [carol, deleted_bob, older_bob, alice])
+
+    changes = diff(old, new, key='NAME')
+    assert changes.inserted == [u'Carol']
+    assert changes.updated == [u'Bob']
+    assert changes.deleted == []
+    assert changes.record_numbers[u'Bob'] == 2
+    assert changes.records(new, [u'Carol'])[0]['NAME'] == u'Carol'
+
+    newer = write(copy_memotest, 'newer', [carol, deleted_bob, alice])
+    changes = diff(new, newer, key='NAME')
+    assert changes.deleted == [u'Bob']
+    assert changes.inserted == changes.updated == []
+
+
+def test_duplicate_key(copy_memotest):
+    table = write(copy_memotest, 'table', [bob, alice, older_bob])
+    with raises(ValueError):
+        Fingerprint.from_table(table, key='NAME')
+
+    # Deleted records can have the same key as a live one.
+    table = write(copy_memotest, 'deleted',
+                  [deleted_bob, older_bob, deleted_bob])
+    fingerprint = Fingerprint.from_table(table, key='NAME')
+    assert [recno for recno, _, _ in fingerprint.entries.values()] == [1]
+
+
+def test_fingerprint_file(tmpdir, copy_memotest):
+    old = write(copy_memotest, 'old', [alice, bob, deleted_guy])
+    new = write(copy_memotest, 'new', [alice, older_bob, undeleted_guy])
+
+    filename = str(tmpdir.join('old.fp'))
+    Fingerprint.from_table(old, key='NAME').save(filename)
+    fingerprint = Fingerprint.load(filename)
+    assert fingerprint.key == 'NAME'
+    assert len(fingerprint) == 3
+
+    changes = diff(fingerprint, new)
+    assert changes.updated == [u'Bob']
+    assert changes.undeleted == [u'Deleted Guy']
+
+    Fingerprint.from_table(old).save(filename)
+    changes = diff(Fingerprint.load(filename), new)
+    assert changes.updated == [1]
+
+    with raises(ValueError):
+        diff(Fingerprint.load(filename), new, key='NAME')
+
+
+def test_invalid_fingerprint_file(tmpdir):
+    filename = str(tmpdir.join('bad.fp'))
+    with open(filename, 'wb') as outfile:
+        outfile.write(b'bad')
+    with raises(ValueError):
+        Fingerprint.load(filename)
+
+
+def test_truncated_fingerprint_file(tmpdir, copy_memotest):
+    table = write(copy_memotest, 'table', [alice, bob])
+    filename = str(tmpdir.join('table.fp'))
+    Fingerprint.from_table(table, key='NAME').save(filename)
+    with open(filename, 'rb') as infile:
+        data = infile.read()
+
+    # Cut in an entry header and in the key data.
+    for size in [FingerprintHeader.size + 5, len(data) - 2]:
+        with open(filename, 'wb') as outfile:
+            outfile.write(data[:size])
+        with raises(ValueError):
+            Fingerprint.load(filename)
@@ -1,6 +1,7 @@
 import datetime
 from decimal import Decimal
 from pytest import raises
+from dbfread import DBF
 from dbfread.field_parser import FieldParser
 
 class MockHeader(object):
@@ -178,3 +179,88 @@ def test_hex_field():
     field = MockField('?')
 
     parser.parse(field, b'test')
+
+def test_uses_default_parser():
+    class CustomFieldParser(FieldParser):
+        def parseC(self, field, data):
+            return data
+
+    parser = CustomFieldParser(MockDBF())
+    assert not parser.uses_default_parser('C')
+    assert parser.uses_default_parser('D')
+    # Alias for parseI.
+    assert parser.uses_default_parser('+')
+    assert not parser.uses_default_parser('?')
+
+    class InvalidValueParser(FieldParser):
+        def parse(self, field, data):
+            return FieldParser.parse(self, field, data)
+
+    assert not InvalidValueParser(MockDBF()).uses_default_parser('D')
+
+
+def test_get_parse_function():
+    parser = FieldParser(MockDBF())
+    assert parser.get_parse_function(MockField('C')) == parser.parseC
+    assert parser.get_parse_function(MockField('+')) == parser.parse2B
+    assert parser.get_parse_function(MockField('?')) == parser.parse
+
+    class MyParser(FieldParser):
+        def parse(self, field, data):
+            return data
+
+    parser = MyParser(MockDBF())
+    assert parser.get_parse_function(MockField('C')) == parser.parse
+
+
+class UpperParser(FieldParser):
+    def parse(self, field, data):
+        value = FieldParser.parse(self, field, data)
+        if field.type == 'C':
+            value = value.upper()
+        return value
+
+
+def test_read_with_parse_override():
+    table = DBF('tests/cases/memotest.dbf', parserclass=UpperParser)
+    assert [r['NAME'] for r in table] == [u'ALICE', u'BOB']
+    table.load()
+    assert [r['NAME'] for r in table.deleted] == [u'DELETED GUY']
+    with table:
+        assert table.get_record(1)['NAME'] == u'BOB'
+
+
+def test_N_numeric_mode():
+    def make_parse(numeric_mode, decimal_count):
+        dbf = MockDBF()
+        dbf.numeric_mode = numeric_mode
+        parser = FieldParser(dbf)
+        field = MockField('N', decimal_count=decimal_count)
+        func = parser.get_parse_function(field)
+        return lambda data: [func(field, data), parser.parse(field, data)]
+
+    parse = make_parse('float', 0)
+    assert parse(b'  12') == [12, 12]
+    assert parse(b'    ') == [None, None]
+    assert parse(b'12**') == [12, 12]
+    # Decimals in a field with no decimals don't change the type.
+    with raises(ValueError):
+        make_parse('float', 0)(b' 1.5')
+
+    parse = make_parse('float', 2)
+    assert parse(b' 1.00') == [1.0, 1.0]
+    assert type(parse(b' 1.00')[0]) is float
+    assert parse(b'   12') == [12.0, 12.0]
+    assert type(parse(b'   12')[0]) is float
+    assert parse(b' 1,50') == [1.5, 1.5]
+    assert parse(b'*****') == [None, None]
+
+    parse = make_parse('decimal', 2)
+    assert parse(b' 1.25') == [Decimal('1.25'), Decimal('1.25')]
+    assert parse(b'1.25*') == [Decimal('1.25'), Decimal('1.25')]
+    assert parse(b'     ') == [None, None]
+
+    for numeric_mode in ['float', 'decimal']:
+        for decimal_count in [0, 2]:
+            with raises(ValueError):
+                make_parse(numeric_mode, decimal_count)(b'okasd')
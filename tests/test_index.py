@@ -0,0 +1,191 @@
+import struct
+import datetime
+from pytest import raises
+from dbfread import DBF
+from dbfread.index import FoxProIndex, NDXIndex
+from test_read_and_length import records
+
+# (key, record number) in key order. Record numbers start at 1.
+NAMES = [(b'Alice', 1), (b'Bob', 2), (b'Deleted Guy', 3)]
+DATES = [(datetime.date(1979, 12, 22), 3),
+         (datetime.date(1980, 11, 12), 2),
+         (datetime.date(1987, 3, 1), 1)]
+
+
+def make_ndx(entries, keylen):
+    """Return an NDX file with two levels."""
+    entry_size = keylen + 8
+    header = struct.pack('<LL4xHHHH', 1, 4, keylen, 10, 0, entry_size)
+    header = (header + b'\0\0\0\0' + b'NAME').ljust(512, b'\0')
+
+    def node(count, items):
+        data = struct.pack('<L', count)
+        for child, recno, key in items:
+            data += struct.pack('<LL', child, recno) + key.ljust(keylen)
+        return data.ljust(512, b'\0')
+
+    leaves = [entries[:2], entries[2:]]
+    root = node(1, [(2, 0, leaves[0][-1][0]), (3, 0, b'')])
+    return header + root + b''.join(
+        node(len(leaf), [(0, recno, key) for key, recno in leaf])
+        for leaf in leaves)
+
+
+def make_foxpro_header(root, keylen, expression):
+    header = bytearray(1024)
+    struct.pack_into('<liiHBB', header, 0, root, -1, 0, keylen, 0x60, 1)
+    struct.pack_into('<H', header, 0x1fe, len(expression))
+    header[0x200:0x200 + len(expression)] = expression
+    return bytes(header)
+
+
+def make_compact_leaf(entries, keylen, pad=b' '):
+    node = bytearray(512)
+    struct.pack_into('<HHiiHLBBBBBB', node, 0, 3, len(entries), -1, -1,
+                     0, 0xffff, 0xff, 0xff, 16, 8, 8, 4)
+    pos = 512
+    previous = b''
+    for i, (key, recno) in enumerate(entries):
+        key = key.ljust(keylen, pad)
+        dup = 0
+        while dup < keylen and previous[dup:dup + 1] == key[dup:dup + 1]:
+            dup += 1
+        trail = min(len(key) - len(key.rstrip(pad)), keylen - dup)
+        stored = key[dup:keylen - trail]
+        pos -= len(stored)
+        node[pos:pos + len(stored)] = stored
+        struct.pack_into('<L', node, 24 + i * 4,
+                         recno | dup << 16 | trail << 24)
+        previous = key
+    return bytes(node)
+
+
+def make_interior(entries, keylen):
+    node = struct.pack('<HHii', 1, len(entries), -1, -1)
+    for key, recno, child in entries:
+        node += key.ljust(keylen) + struct.pack('>LL', recno, child)
+    return node.ljust(512, b'\0')
+
+
+def make_idx_node(attributes, entries, keylen):
+    """Return a node in an IDX file that is not compact."""
+    node = struct.pack('<HHii', attributes, len(entries), -1, -1)
+    for key, pointer in entries:
+        node += key.ljust(keylen) + struct.pack('>L', pointer)
+    return node.ljust(512, b'\0')
+
+
+def make_idx(entries, keylen):
+    """Return an IDX file that is not compact with two levels."""
+    header = bytearray(512)
+    struct.pack_into('<liiHBB', header, 0, 512, -1, 2048, keylen, 0, 0)
+    header[16:20] = b'NAME'
+
+    leaves = [entries[:2], entries[2:]]
+    return b''.join([
+        bytes(header),
+        # Root node with the last key of each leaf.
+        make_idx_node(1, [(leaves[0][-1][0], 1024),
+                          (leaves[1][-1][0], 1536)], keylen),
+        make_idx_node(2, leaves[0], keylen),
+        make_idx_node(2, leaves[1], keylen),
+    ])
+
+
+def make_cdx(table):
+    date_index = FoxProIndex.__new__(FoxProIndex)
+    date_index.text = False
+    date_index.keylen = 8
+    dates = [(date_index.encode_key(date), recno) for date, recno in DATES]
+
+    return b''.join([
+        # Tag directory.
+        make_foxpro_header(1024, 10, b''),
+        make_compact_leaf([(b'BIRTHDATE', 4096), (b'NAME', 1536)], 10),
+        # NAME tag with two levels.
+        make_foxpro_header(2560, 16, b'NAME'),
+        make_interior([(b'Bob', 2, 3072), (b'Deleted Guy', 3, 3584)], 16),
+        make_compact_leaf(NAMES[:2], 16),
+        make_compact_leaf(NAMES[2:], 16),
+        # BIRTHDATE tag.
+        make_foxpro_header(5120, 8, b'BIRTHDATE'),
+        make_compact_leaf(dates, 8, b'\0'),
+    ])
+
+
+def test_cdx(tmpdir, copy_memotest):
+    filename = copy_memotest()
+    table = DBF(filename)
+    with open(str(tmpdir.join('memotest.cdx')), 'wb') as outfile:
+        outfile.write(make_cdx(table))
+
+    with table:
+        assert table.lookup('name', u'Bob') == [records[1]]
+        assert table.lookup('NAME', b'Bob') == [records[1]]
+        assert table.lookup('name', u'Carol') == []
+        # Deleted records are left out.
+        assert table.lookup('name', u'Deleted Guy') == []
+        assert table.get_index('name').lookup(u'Deleted Guy') == [2]
+
+        assert list(table.range('name')) == records
+        assert list(table.range('name', u'B')) == [records[1]]
+        assert list(table.range('birthdate')) == records[::-1]
+        assert list(table.range('birthdate', datetime.date(1980, 1, 1),
+                                datetime.date(1985, 1, 1))) == [records[1]]
+        assert table.get_index('birthdate').lookup(
+            datetime.date(1979, 12, 22)) == [2]
+
+        with raises(ValueError):
+            table.lookup('age', 10)
+
+
+def test_number_keys_sort():
+    index = FoxProIndex.__new__(FoxProIndex)
+    index.text = False
+    index.keylen = 8
+    numbers = [-1e10, -2.5, -1, 0, 0.5, 1, 3, 1e10]
+    assert sorted(numbers, key=index.encode_key) == numbers
+
+
+def test_ndx(tmpdir, copy_memotest):
+    filename = copy_memotest()
+    ndx_filename = str(tmpdir.join('names.ndx'))
+    with open(ndx_filename, 'wb') as outfile:
+        outfile.write(make_ndx(NAMES, 16))
+
+    with DBF(filename) as table:
+        index = table.open_index(ndx_filename)
+        assert isinstance(index, NDXIndex)
+        assert index.expression == 'NAME'
+        assert table.lookup('names', 'Alice') == [records[0]]
+        assert list(table.range('names', high='Bob')) == records
+        assert index.lookup('Deleted Guy') == [2]
+
+
+def test_idx(tmpdir, copy_memotest):
+    filename = copy_memotest()
+    idx_filename = str(tmpdir.join('names.idx'))
+    with open(idx_filename, 'wb') as outfile:
+        outfile.write(make_idx(NAMES, 16))
+
+    with DBF(filename) as table:
+        index = table.open_index(idx_filename)
+        assert isinstance(index, FoxProIndex)
+        assert not index.compact
+        assert index.expression == 'NAME'
+        assert table.lookup('names', 'Bob') == [records[1]]
+        assert table.lookup('names', 'Carol') == []
+        assert list(table.range('names')) == records
+        assert list(table.range('names', 'B', 'C')) == [records[1]]
+        assert index.lookup('Deleted Guy') == [2]
+
+        # The file is kept open between lookups.
+        infile = index._file
+        index.lookup('Alice')
+        assert index._file is infile
+
+    # Closed with the table.
+    assert infile.closed
+    assert index._file is None
+    assert index.lookup('Alice') == [0]
+    index.close()
@@ -0,0 +1,71 @@
+import os
+import datetime
+from decimal import Decimal
+from pytest import raises
+from dbfread import DBF
+from dbfread.keyindex import KeyIndex, key_hash
+from test_read_and_length import records
+
+
+def test_key_hash():
+    assert key_hash(1) == key_hash(1.0) == key_hash(Decimal('1.00'))
+    assert key_hash(1) != key_hash(u'1')
+    assert key_hash(True) != key_hash(1)
+    assert key_hash(float('nan')) == key_hash(float('nan'))
+
+
+def test_find(tmpdir, copy_memotest):
+    filename = copy_memotest()
+    with DBF(filename) as table:
+        path = table.build_index('NAME')
+        assert path == filename + '.NAME.dbfx'
+        assert len(KeyIndex(path)) == 2
+
+        assert table.find('NAME', u'Bob') == [records[1]]
+        assert table.find('NAME', u'Carol') == []
+        # Deleted records are not in the index.
+        assert table.find('NAME', u'Deleted Guy') == []
+
+        table.build_index('BIRTHDATE', str(tmpdir.join('dates.dbfx')))
+        assert table.find('BIRTHDATE', datetime.date(1987, 3, 1)) \
+            == [records[0]]
+
+    # The index file is found by the next table object.
+    with DBF(filename) as table:
+        assert table.find('NAME', u'Alice') == [records[0]]
+
+
+def test_find_without_index(copy_memotest):
+    filename = copy_memotest()
+    table = DBF(filename)
+    with raises(ValueError):
+        table.find('NAME', u'Alice')
+    with raises(ValueError):
+        table.build_index('MEMO')
+    with raises(ValueError):
+        table.build_index('AGE')
+
+
+def test_index_out_of_date(copy_memotest):
+    filename = copy_memotest()
+    with DBF(filename) as table:
+        table.build_index('NAME')
+        assert table.find('NAME', u'Alice') == [records[0]]
+
+        with open(filename, 'rb') as infile:
+            data = infile.read()
+        with open(filename, 'wb') as outfile:
+            outfile.write(data.replace(b'Alice', b'Carol'))
+        # Make sure the time is not the same.
+        os.utime(filename, (0, 0))
+
+        assert table.find('NAME', u'Alice') == []
+        assert table.find('NAME', u'Carol')[0]['NAME'] == u'Carol'
+
+
+def test_invalid_index_file(tmpdir):
+    filename = str(tmpdir.join('bad.dbfx'))
+    with open(filename, 'wb') as outfile:
+        outfile.write(b'not an index')
+    with raises(ValueError):
+        KeyIndex(filename)
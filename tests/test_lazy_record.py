@@ -0,0 +1,40 @@
+from pytest import raises
+from dbfread import DBF
+from dbfread.record import LazyRecord
+from test_read_and_length import records
+
+
+def test_lazy_records():
+    with DBF('tests/cases/memotest.dbf', lazy_records=True) as table:
+        lazy_records = list(table)
+
+        record = lazy_records[1]
+        assert isinstance(record, LazyRecord)
+        assert record._values is None
+        assert record['NAME'] == record.NAME == u'Bob'
+        # Only the field that was used has been parsed.
+        assert record._values.count(u'Bob') == 1
+        assert len(record) == 3
+        assert list(record) == ['NAME', 'BIRTHDATE', 'MEMO']
+        assert lazy_records == records
+        assert dict(record) == records[1]
+
+
+def test_missing_field():
+    table = DBF('tests/cases/memotest.dbf', lazy_records=True,
+                columns=['NAME'])
+    record = next(iter(table))
+    assert record == {'NAME': u'Alice'}
+    with raises(KeyError):
+        record['MEMO']
+    with raises(AttributeError):
+        record.MEMO
+
+
+def test_memo_after_close():
+    table = DBF('tests/cases/memotest.dbf', lazy_records=True)
+    table.load()
+    table.close()
+    # The memo file is opened again.
+    assert table.records[0]['MEMO'] == u'Alice memo'
+    table.close()
@@ -1,6 +1,8 @@
+import struct
 from pytest import raises
 from dbfread import DBF
 from dbfread import MissingMemoFile
+from dbfread.memo import MemoCache, LazyMemo, DB3MemoFile, DB4MemoFile
 
 def test_missing_memofile():
     with raises(MissingMemoFile):
@@ -12,3 +14,89 @@ def test_missing_memofile():
     # Memo fields should be returned as None.
     record = next(iter(table))
     assert record['MEMO'] is None
+
+
+def test_memo_cache():
+    table = DBF('tests/cases/memotest.dbf', memo_cache_size=1000)
+    assert list(table) == list(table)
+    assert table.memo_cache.misses == 2
+    assert table.memo_cache.hits == 2
+    assert table.memo_cache.size == len(b'Alice memo') + len(b'Bob memo')
+
+
+def test_memo_cache_eviction():
+    cache = MemoCache(10)
+    assert cache.get(1, lambda i: b'12345') == b'12345'
+    assert cache.get(2, lambda i: b'123456') == b'123456'
+    # The first memo was evicted.
+    assert (len(cache), cache.size) == (1, 6)
+    cache.get(2, None)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Too large to cache.
+    cache.get(3, lambda i: b'12345678901')
+    assert (len(cache), cache.size) == (1, 6)
+
+
+def test_lazy_memos():
+    with DBF('tests/cases/memotest.dbf', lazy_memos=True) as table:
+        memos = [record['MEMO'] for record in table]
+        assert isinstance(memos[0], LazyMemo)
+        assert [memo.value for memo in memos] == [u'Alice memo', u'Bob memo']
+        assert list(memos[1].iter_chunks(3)) == [b'Bob', b' me', b'mo']
+        assert table[0]['MEMO'].value == u'Alice memo'
+
+    # The memo file is reopened after close().
+    assert memos[0].value == u'Alice memo'
+    assert b''.join(memos[0].iter_chunks()) == b'Alice memo'
+
+
+def test_lazy_memos_where():
+    table = DBF('tests/cases/memotest.dbf', lazy_memos=True,
+                where={'MEMO': u'Bob memo'})
+    assert [record['NAME'] for record in table] == [u'Bob']
+    table.close()
+
+
+def test_dbase_memo_chunks(tmpdir):
+    filename = str(tmpdir.join('test.dbt'))
+    with open(filename, 'wb') as outfile:
+        outfile.write(b'\0' * 512 + b'Hello world\x1a\x1a'.ljust(512))
+        outfile.write(b'\xff\xff\x08\x08' + struct.pack('<L', 13))
+        outfile.write(b'Hello\x1fworld')
+
+    with DB3MemoFile(filename) as memofile:
+        assert list(memofile.iter_chunks(1, 5)) == [b'Hello', b' worl', b'd']
+        assert b''.join(memofile.iter_chunks(1)) == memofile[1]
+
+    with DB4MemoFile(filename) as memofile:
+        assert list(memofile.iter_chunks(2, 3)) == [b'Hel', b'lo']
+        assert b''.join(memofile.iter_chunks(2)) == memofile[2]
+
+
+def test_view():
+    with DBF('tests/cases/memotest.dbf', lazy_memos=True) as table:
+        memo = next(iter(table))['MEMO']
+        view = memo.view()
+        assert isinstance(view, memoryview)
+        assert view.tobytes() == b'Alice memo'
+        del view
+
+
+def test_large_dbase3_memo(tmpdir):
+    filename = str(tmpdir.join('test.dbt'))
+    memo = b'x' * (1024 * 1024)
+    with open(filename, 'wb') as outfile:
+        outfile.write(b'\0' * 512 + memo + b'\x1a\x1a')
+
+    with DB3MemoFile(filename) as memofile:
+        assert memofile[1] == memo
+        assert memofile.view(1) == memo
+        assert memofile[2] == memo[512:]
+
+
+def test_empty_memofile(tmpdir):
+    filename = str(tmpdir.join('test.dbt'))
+    open(filename, 'wb').close()
+    with DB3MemoFile(filename) as memofile:
+        assert memofile[1] == b''
@@ -0,0 +1,87 @@
+import datetime
+from pytest import importorskip, raises
+from dbfread import DBF, FieldParser, InvalidValue
+from dbfread.numpy_export import _convert_column
+from test_field_parser import MockDBF, MockField
+
+np = importorskip('numpy')
+
+
+def test_to_numpy():
+    table = DBF('tests/cases/memotest.dbf')
+    array = table.to_numpy()
+
+    assert array.dtype.names == tuple(table.field_names)
+    assert list(array['NAME']) == [r['NAME'] for r in table]
+    assert list(array['MEMO']) == [r['MEMO'] for r in table]
+    assert list(array['BIRTHDATE'].astype(datetime.date)) == \
+        [r['BIRTHDATE'] for r in table]
+
+
+def test_columns():
+    table = DBF('tests/cases/memotest.dbf')
+    assert table.to_numpy(columns=['NAME']).dtype.names == ('NAME',)
+
+
+def test_where():
+    table = DBF('tests/cases/memotest.dbf', where={'NAME': u'Bob'})
+    assert list(table.to_numpy()['NAME']) == ['Bob']
+
+
+def test_iter_numpy():
+    table = DBF('tests/cases/memotest.dbf')
+    arrays = list(table.iter_numpy(batch_size=1))
+
+    # The third record is deleted.
+    assert [len(array) for array in arrays] == [1, 1, 0]
+    assert [array['NAME'][0] for array in arrays[:2]] == ['Alice', 'Bob']
+
+
+def test_raw():
+    table = DBF('tests/cases/memotest.dbf', raw=True)
+    assert list(table.to_numpy()['MEMO']) == [r['MEMO'] for r in table]
+
+
+def test_parser_overrides():
+    class MyFieldParser(FieldParser):
+        def parse(self, field, data):
+            try:
+                return FieldParser.parse(self, field, data)
+            except ValueError:
+                return InvalidValue(data)
+
+    table = DBF('examples/files/invalid_value.dbf', parserclass=MyFieldParser)
+    array = table.to_numpy()
+    assert list(array['BIRTHDATE']) == [r['BIRTHDATE'] for r in table]
+
+
+def convert(field_type, values, **kwargs):
+    field = MockField(field_type, length=len(values[0]), **kwargs)
+    column = np.array(values)
+    return list(_convert_column(np, MockDBF(), field, column))
+
+
+def test_convert_number():
+    values = convert('N', [b' 1', b'-2', b'  ', b'**', b'3,5'])
+    assert values[:2] == [1.0, -2.0]
+    assert np.isnan(values[2]) and np.isnan(values[3])
+    assert values[4] == 3.5
+
+
+def test_convert_logical():
+    assert convert('L', [b'T', b'n', b'?', b' ']) == [True, False, None, None]
+
+
+def test_convert_date():
+    column = np.array([[ord(c) for c in '19700101'],
+                       [ord(c) for c in '        '],
+                       [ord(c) for c in '20000229']], dtype='u1')
+    field = MockField('D', length=8)
+    dates = _convert_column(np, MockDBF(), field, column)
+    assert str(dates[0]) == '1970-01-01'
+    assert np.isnat(dates[1])
+    assert str(dates[2]) == '2000-02-29'
+
+    column = np.array([[ord(c) for c in '20010229']], dtype='u1')
+    with raises(ValueError):
+        _convert_column(np, MockDBF(), field, column)
@@ -0,0 +1,42 @@
+from pytest import raises
+from dbfread import DBF
+from dbfread.parallel import read, iter_records
+from test_read_and_length import records, deleted_records
+
+
+def test_read():
+    assert list(read('tests/cases/memotest.dbf', workers=2,
+                     batch_size=1)) == records
+
+
+def test_unordered():
+    result = read('tests/cases/memotest.dbf', workers=2, ordered=False,
+                  batch_size=1)
+    assert sorted(result, key=lambda r: r['NAME']) == records
+
+
+def test_options():
+    table = DBF('tests/cases/memotest.dbf', columns=['NAME'],
+                where={'NAME': u'Bob'}, recfactory=None)
+    assert list(iter_records(table, workers=1)) == [[('NAME', u'Bob')]]
+
+
+def test_deleted():
+    table = DBF('tests/cases/memotest.dbf')
+    assert list(iter_records(table, workers=1,
+                             deleted=True)) == deleted_records
+
+
+def test_batch_size():
+    with raises(ValueError):
+        list(read('tests/cases/memotest.dbf', batch_size=0))
+
+
+def test_unsupported_options():
+    for options in [{'lazy_memos': True},
+                    {'lazy_records': True},
+                    {'stats': True},
+                    {'stats_callback': len}]:
+        table = DBF('tests/cases/memotest.dbf', **options)
+        with raises(ValueError):
+            list(iter_records(table, workers=1))
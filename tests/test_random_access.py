@@ -0,0 +1,36 @@
+from pytest import raises
+from dbfread import DBF
+from test_read_and_length import records, deleted_records
+
+
+def test_get_record():
+    with DBF('tests/cases/memotest.dbf') as table:
+        assert table.get_record(0) == records[0]
+        assert table[1] == records[1]
+        assert table[2] == deleted_records[0]
+        assert table[-1] == deleted_records[0]
+
+        with raises(IndexError):
+            table[3]
+
+
+def test_slice():
+    with DBF('tests/cases/memotest.dbf') as table:
+        assert table[0:2] == records
+        assert table[::-1] == deleted_records + records[::-1]
+        assert table[5:] == []
+
+
+def test_is_deleted():
+    with DBF('tests/cases/memotest.dbf') as table:
+        assert [table.is_deleted(i) for i in range(3)] == [False, False, True]
+
+
+def test_close():
+    table = DBF('tests/cases/memotest.dbf')
+    assert table[0] == records[0]
+    table.close()
+    table.close()
+    # Reopened on demand.
+    assert table[0] == records[0]
+    table.close()
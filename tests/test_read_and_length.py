@@ -1,9 +1,11 @@
 """
 Tests reading from database.
 """
+import os
 import datetime
-from pytest import fixture
+from pytest import fixture, raises
 from dbfread import DBF
+from dbfread import dbf
 
 @fixture
 def table():
@@ -41,3 +43,45 @@ def test_list(table, loaded_table):
 
     # This should not return old style table which was a subclass of list.
     assert not isinstance(table, list)
+
+
+def test_small_blocks(monkeypatch):
+    # One record per block.
+    monkeypatch.setattr(dbf, 'BLOCK_SIZE', 1)
+    table = DBF('tests/cases/memotest.dbf')
+    assert list(table) == records
+    assert list(table.deleted) == deleted_records
+
+
+def test_len_cache(copy_memotest):
+    filename = copy_memotest()
+    table = DBF(filename)
+    assert (len(table), len(table.deleted)) == (2, 1)
+
+    # Mark the first record as deleted.
+    with open(filename, 'r+b') as outfile:
+        outfile.seek(table.header.headerlen)
+        outfile.write(b'*')
+    os.utime(filename, (0, 0))
+    assert (len(table), len(table.deleted)) == (1, 2)
+
+
+def test_len_end_marker(copy_memotest):
+    filename = copy_memotest()
+    table = DBF(filename)
+    with open(filename, 'r+b') as outfile:
+        outfile.seek(table.header.headerlen + table.header.recordlen)
+        outfile.write(b'\x1a')
+    os.utime(filename, (0, 0))
+    assert len(table) + len(table.deleted) == len(list(table)) == 1
+
+
+def test_iter_all(table):
+    assert list(table.iter_all()) == [(False, records[0]),
+                                      (False, records[1]),
+                                      (True, deleted_records[0])]
+
+
+def test_invalid_numeric_mode():
+    with raises(ValueError):
+        DBF('tests/cases/memotest.dbf', numeric_mode='int')
@@ -0,0 +1,69 @@
+from dbfread import DBF
+from dbfread.stats import Stats
+
+
+def test_stats_disabled():
+    table = DBF('tests/cases/memotest.dbf')
+    assert table.stats is None
+    with table._open_table_file() as infile:
+        assert not hasattr(infile, '_stats')
+
+
+def test_stats():
+    table = DBF('tests/cases/memotest.dbf', stats=True)
+    assert isinstance(table.stats, Stats)
+    list(table)
+
+    stats = table.stats
+    assert stats.records == 2
+    assert stats.passes == 1
+    assert stats.seconds > 0
+    assert stats.records_per_second > 0
+    assert stats.table_io.reads >= 1
+    assert stats.table_io.bytes_read > 0
+    assert stats.recfactory.count == 2
+
+    assert sorted(stats.fields) == ['BIRTHDATE', 'MEMO', 'NAME']
+    assert stats.fields['NAME'].count == 2
+    assert stats.types['C'].count == 2
+    assert stats.memo_time.count == 2
+    assert stats.memo_io.reads == 2
+
+    table.load()
+    assert stats.records == 5
+    assert stats.passes == 2
+
+    stats.reset()
+    assert stats.records == 0
+    assert stats.fields == {}
+
+
+def test_stats_callback():
+    calls = []
+    table = DBF('tests/cases/memotest.dbf', stats_callback=calls.append,
+                memo_cache_size=10)
+    list(table.iter_batches(10, layout='columns'))
+    assert calls == [table.stats]
+    assert table.stats.records == 2
+
+    values = table.stats.as_dict()
+    assert values['records'] == 2
+    assert values['memo_cache_misses'] == 2
+    assert values['memo_io']['reads'] == 2
+    assert values['types']['D']['count'] == 2
+
+
+def test_memo_cache_hits():
+    table = DBF('tests/cases/memotest.dbf', stats=True,
+                memo_cache_size=1000)
+    list(table)
+    list(table)
+
+    stats = table.stats
+    assert stats.memo_time.count == 4
+    assert stats.memo_io.reads == 2
+    assert stats.memo_cache_misses == 2
+    assert stats.memo_cache_hits == 2
+
+    stats.reset()
+    assert stats.memo_cache_hits == stats.memo_cache_misses == 0
@@ -0,0 +1,87 @@
+import struct
+from pytest import raises
+from dbfread import DBF
+from dbfread.tail import TailReader
+
+table = DBF('tests/cases/memotest.dbf')
+with open(table.filename, 'rb') as infile:
+    data = infile.read()
+header = data[:table.header.headerlen]
+record_data = [data[table.header.headerlen + i * table.header.recordlen:]
+               [:table.header.recordlen] for i in range(3)]
+
+
+def write(filename, records, numrecords=None, header=header):
+    if numrecords is None:
+        numrecords = len(records)
+    header = header[:4] + struct.pack('<L', numrecords) + header[8:]
+    with open(filename, 'wb') as outfile:
+        outfile.write(header + b''.join(records) + b'\x1a')
+
+
+def names(records):
+    return [record['NAME'] for record in records]
+
+
+def test_tail(copy_memotest):
+    filename = copy_memotest('tail')
+    alice, bob, deleted = record_data
+
+    write(filename, [alice])
+    tail = TailReader(filename)
+    assert names(tail.read()) == ['Alice']
+    assert tail.read() == []
+
+    write(filename, [alice, deleted, bob])
+    assert names(tail.read()) == ['Bob']
+    assert not tail.restarted
+    assert tail.position == 3
+
+    # Continue from a checkpoint.
+    write(filename, [alice, deleted, bob, alice])
+    tail = TailReader(filename, tail.checkpoint)
+    assert names(tail.read()) == ['Alice']
+
+    # Records not counted in the header are left for later.
+    write(filename, [alice, deleted, bob, alice, bob], numrecords=4)
+    assert tail.read() == []
+    write(filename, [alice, deleted, bob, alice, bob])
+    assert names(tail.read()) == ['Bob']
+
+
+def test_tail_restart(copy_memotest):
+    filename = copy_memotest('tail')
+    alice, bob, deleted = record_data
+
+    write(filename, [alice, bob])
+    tail = TailReader(filename)
+    tail.read()
+
+    # Truncated.
+    write(filename, [alice])
+    assert names(tail.read()) == ['Alice']
+    assert tail.restarted
+
+    # Last record rewritten.
+    write(filename, [bob, bob])
+    assert names(tail.read()) == ['Bob', 'Bob']
+    assert tail.restarted
+
+    assert tail.read() == []
+    assert not tail.restarted
+
+
+def test_invalid_checkpoint():
+    with raises(ValueError):
+        TailReader('tests/cases/memotest.dbf', 'nonsense')
+    with raises(ValueError):
+        TailReader('tests/cases/memotest.dbf', 'other-version:1:0:0')
+
+
+def test_tail_ignorecase(tmpdir, copy_memotest):
+    filename = copy_memotest('tail')
+    write(filename, [record_data[0]])
+
+    # The file name is resolved by DBF().
+    tail = TailReader(str(tmpdir.join('TAIL.DBF')))
+    assert names(tail.read()) == ['Alice']
@@ -0,0 +1,58 @@
+from dbfread import DBF, FieldParser
+from dbfread.value_cache import ValueCache
+from test_read_and_length import records
+
+
+class DateParser(FieldParser):
+    def parseD(self, field, data):
+        return FieldParser.parseD(self, field, data)
+
+
+def test_value_cache():
+    cache = ValueCache(2)
+    calls = []
+
+    def parse(field, data):
+        calls.append(data)
+        return data.upper()
+
+    parse_cached = cache.wrap(parse)
+    for data in [b'a', b'b', b'a', b'c', b'c']:
+        assert parse_cached(None, data) == data.upper()
+
+    # c didn't fit in the cache.
+    assert calls == [b'a', b'b', b'c', b'c']
+    assert (len(cache), cache.hits, cache.misses) == (2, 1, 4)
+    assert cache.hit_rate == 0.2
+
+
+def test_table_value_caches():
+    table = DBF('tests/cases/memotest.dbf')
+    assert list(table) == list(table) == records
+    assert list(table.value_caches) == ['BIRTHDATE']
+    cache = table.value_caches['BIRTHDATE']
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    table = DBF('tests/cases/memotest.dbf', value_cache_types='CD')
+    assert list(table) == records
+    assert sorted(table.value_caches) == ['BIRTHDATE', 'NAME']
+
+    table = DBF('tests/cases/memotest.dbf', value_cache_types=None)
+    assert list(table) == records
+    assert table.value_caches == {}
+
+
+def test_value_caches_in_batches_and_lazy_records():
+    table = DBF('tests/cases/memotest.dbf')
+    list(table.iter_batches(layout='columns'))
+    assert table.value_caches['BIRTHDATE'].misses == 2
+
+    with DBF('tests/cases/memotest.dbf', lazy_records=True) as table:
+        assert list(table) == records
+        assert table.value_caches['BIRTHDATE'].misses == 2
+
+
+def test_custom_parser_not_cached():
+    table = DBF('tests/cases/memotest.dbf', parserclass=DateParser)
+    list(table)
+    assert table.value_caches == {}
@@ -0,0 +1,57 @@
+import datetime
+from pytest import raises
+from dbfread import DBF, FieldParser
+from test_read_and_length import records, deleted_records
+
+
+def names(where, **kwargs):
+    table = DBF('tests/cases/memotest.dbf', where=where, **kwargs)
+    return [record['NAME'] for record in table]
+
+
+def test_text():
+    assert names({'NAME': u'Bob'}) == ['Bob']
+    assert names({'NAME': set([u'Alice', u'Bob', u'Carol'])}) == ['Alice',
+                                                                  'Bob']
+    assert names({'NAME': u'Bo'}) == []
+    assert names({'NAME': u'\u263a'}) == []
+
+
+def test_date():
+    assert names({'BIRTHDATE': datetime.date(1980, 11, 12)}) == ['Bob']
+    assert names({'BIRTHDATE': (datetime.date(1985, 1, 1), None)}) == \
+        ['Alice']
+    assert names({'BIRTHDATE': (None, datetime.date(1985, 1, 1))}) == ['Bob']
+
+
+def test_function():
+    assert names({'MEMO': lambda memo: memo.startswith('Alice')}) == ['Alice']
+
+
+def test_custom_parser():
+    class ReverseParser(FieldParser):
+        def parseC(self, field, data):
+            return FieldParser.parseC(self, field, data)[::-1]
+
+    assert names({'NAME': u'boB'}, parserclass=ReverseParser) == ['boB']
+
+
+def test_combined():
+    where = {'NAME': set([u'Alice', u'Bob']),
+             'BIRTHDATE': (datetime.date(1985, 1, 1), None)}
+    assert names(where) == ['Alice']
+
+
+def test_deleted_and_len():
+    table = DBF('tests/cases/memotest.dbf', where={'NAME': u'Deleted Guy'})
+    assert len(table) == 0
+    assert len(table.deleted) == 1
+    assert list(table.deleted) == deleted_records
+
+    table.load()
+    assert table.records == []
+
+
+def test_unknown_field():
+    with raises(ValueError):
+        DBF('tests/cases/memotest.dbf', where={'AGE': 10})